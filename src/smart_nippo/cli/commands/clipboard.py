@@ -1,10 +1,9 @@
 """Clipboard operations command for smart-nippo"""
 
-import pyperclip
 import typer
 from rich.console import Console
 
-console = Console()
+console = Console(highlight=False, emoji=False)
 
 
 def clipboard(
@@ -18,11 +17,20 @@ def clipboard(
     quiet: bool = typer.Option(False, "--quiet", "-q", help="メッセージを表示しない"),
 ) -> None:
     """指定されたテキストをクリップボードにコピーします"""
+    import pyperclip
 
     try:
         # テキストをフォーマット
         if format_template:
-            formatted_text = format_template.format(text=text)
+            if (
+                format_template.count("{") == 1
+                and format_template.count("}") == 1
+                and "{text}" in format_template
+            ):
+                # {text} が1つだけの一般的なケースは単純な置換で済ませる
+                formatted_text = format_template.replace("{text}", text)
+            else:
+                formatted_text = format_template.format(text=text)
         else:
             formatted_text = f"{prefix}{text}{suffix}"
 
@@ -45,6 +53,7 @@ def clipboard(
 
 def paste() -> None:
     """クリップボードの内容を表示します"""
+    import pyperclip
 
     try:
         clipboard_content = pyperclip.paste()
@@ -1,10 +1,9 @@
 """Editor integration command for smart-nippo"""
 
-import click
 import typer
 from rich.console import Console
 
-console = Console()
+console = Console(highlight=False, emoji=False)
 
 
 def edit(
@@ -24,15 +23,9 @@ def edit(
     デフォルトのエディタが起動し、編集した内容を取得できます。
     エディタは環境変数 EDITOR で指定できます。
     """
+    import click
 
     try:
-        # エディタの設定
-        original_editor = None
-        if editor:
-            import os
-            original_editor = os.environ.get("EDITOR")
-            os.environ["EDITOR"] = editor
-
         # 初期テキストの設定
         if not initial_text and not initial_text.strip():
             initial_text = "# ここに内容を入力してください\n# この行は削除できます\n\n"
@@ -40,8 +33,8 @@ def edit(
         console.print("[cyan]エディタを起動しています...[/cyan]")
         console.print("[dim]（編集を完了してエディタを閉じてください）[/dim]")
 
-        # エディタを起動
-        result = click.edit(initial_text, extension=extension)
+        # エディタを起動 (環境変数 EDITOR は書き換えずに直接指定する)
+        result = click.edit(initial_text, editor=editor or None, extension=extension)
 
         if result is None:
             if require_save:
@@ -60,15 +53,16 @@ def edit(
 
         # 結果の表示
         if show_result:
-            line_count = len(result.split('\n'))
+            line_count = result.count("\n") + 1
             char_count = len(result)
-            console.print(
+            separator = "[dim]" + "─" * 60 + "[/dim]"
+            console.print("\n".join([
                 f"\n[bold]編集結果 ([green]{line_count}[/green] 行, "
-                f"[green]{char_count}[/green] 文字):[/bold]"
-            )
-            console.print("[dim]" + "─" * 60 + "[/dim]")
-            console.print(result)
-            console.print("[dim]" + "─" * 60 + "[/dim]")
+                f"[green]{char_count}[/green] 文字):[/bold]",
+                separator,
+                result,
+                separator,
+            ]))
 
         # クリップボードにコピー
         if copy_to_clipboard:
@@ -79,11 +73,6 @@ def edit(
             except Exception as e:
                 console.print(f"[red]✗[/red] クリップボードへのコピーに失敗: {e}")
 
-        # エディタ設定を復元
-        if editor and original_editor:
-            import os
-            os.environ["EDITOR"] = original_editor
-
     except KeyboardInterrupt:
         console.print("\n[yellow]編集が中断されました[/yellow]")
         raise typer.Exit(1) from None
@@ -4,7 +4,7 @@
 import typer
 from rich.console import Console
 
-console = Console()
+console = Console(highlight=False, emoji=False)
 
 
 def hello(
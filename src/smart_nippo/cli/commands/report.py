@@ -1,27 +1,30 @@
 """Report management commands."""
 
-from datetime import datetime, date
 from typing import Optional
 
-import questionary
 import typer
 from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 
-from smart_nippo.core.database import database_exists, init_database
-from smart_nippo.core.services import ReportService, TemplateService
-from smart_nippo.cli.interactive import collect_report_data
+from smart_nippo.cli.utils.database import ensure_database
+from smart_nippo.cli.utils.dates import (
+    format_datetime,
+    format_short_datetime,
+    parse_date,
+)
+from smart_nippo.cli.utils.tables import ColumnSpec, build_table, style
 
-console = Console()
+# questionary・rich の表示部品・サービス層 (SQLAlchemy) は読み込みが重いため,
+# 各コマンドの中で必要になった時点でインポートする
+console = Console(highlight=False, emoji=False)
 app = typer.Typer(help="日報作成・編集コマンド")
 
-
-def ensure_database() -> None:
-    """データベースが存在しない場合は初期化."""
-    if not database_exists():
-        init_database()
-        console.print("[green]データベースを初期化しました[/green]")
+_REPORT_COLUMNS: list[ColumnSpec] = [
+    ("ID", {"style": style("cyan"), "width": 6}),
+    ("日付", {"style": style("green")}),
+    ("テンプレート", {"style": style("blue")}),
+    ("プロジェクト", {"style": style("yellow")}),
+    ("作成日時", {"style": style("dim")}),
+]
 
 
 @app.command("create")
@@ -32,6 +35,11 @@ def create_report(
                                      help="インタラクティブモードで作成"),
 ) -> None:
     """新しい日報を作成."""
+    import questionary
+
+    from smart_nippo.cli.interactive import collect_report_data
+    from smart_nippo.core.services import ReportService, TemplateService
+
     ensure_database()
     
     if not interactive:
@@ -84,7 +92,7 @@ def create_report(
     target_date = None
     if report_date:
         try:
-            target_date = datetime.strptime(report_date, "%Y-%m-%d").date()
+            target_date = parse_date(report_date)
         except ValueError:
             console.print(f"[red]無効な日付形式です: {report_date}[/red]")
             return
@@ -97,7 +105,7 @@ def create_report(
         )
         if existing_report:
             console.print(
-                f"[yellow]{target_date.strftime('%Y-%m-%d')} の日報は既に存在します[/yellow]"
+                f"[yellow]{target_date.isoformat()} の日報は既に存在します[/yellow]"
             )
             
             action = questionary.select(
@@ -149,6 +157,10 @@ def edit_report(
     report_date: Optional[str] = typer.Option(None, "--date", "-d", help="編集する日報の日付 (YYYY-MM-DD)"),
 ) -> None:
     """既存の日報を編集."""
+    import questionary
+
+    from smart_nippo.core.services import ReportService
+
     ensure_database()
     
     console.print("[bold cyan]日報を編集します[/bold cyan]\n")
@@ -163,10 +175,10 @@ def edit_report(
     
     elif report_date:
         try:
-            target_date = datetime.strptime(report_date, "%Y-%m-%d").date()
+            target_date = parse_date(report_date)
             report = ReportService.get_report(report_date=target_date)
             if not report:
-                console.print(f"[red]{target_date.strftime('%Y-%m-%d')} の日報が見つかりません[/red]")
+                console.print(f"[red]{target_date.isoformat()} の日報が見つかりません[/red]")
                 return
         except ValueError:
             console.print(f"[red]無効な日付形式です: {report_date}[/red]")
@@ -201,6 +213,11 @@ def edit_report(
 
 def _edit_existing_report(report) -> None:
     """既存日報の編集処理."""
+    import questionary
+
+    from smart_nippo.cli.interactive import collect_report_data
+    from smart_nippo.core.services import ReportService
+
     console.print(f"[blue]編集対象: {report.get_date()} - {report.template.name}[/blue]\n")
     
     # 現在のデータを表示
@@ -245,6 +262,10 @@ def list_reports(
     limit: int = typer.Option(20, "--limit", "-l", help="表示件数"),
 ) -> None:
     """日報一覧を表示."""
+    from rich.console import Group
+
+    from smart_nippo.core.services import ReportService
+
     ensure_database()
     
     # 日付パラメータの解析
@@ -253,15 +274,15 @@ def list_reports(
     
     try:
         if start_date:
-            start_date_obj = datetime.strptime(start_date, "%Y-%m-%d").date()
+            start_date_obj = parse_date(start_date)
         if end_date:
-            end_date_obj = datetime.strptime(end_date, "%Y-%m-%d").date()
+            end_date_obj = parse_date(end_date)
     except ValueError as e:
         console.print(f"[red]日付形式エラー: {e}[/red]")
         return
     
-    # 日報を取得
-    reports = ReportService.list_reports(
+    # 日報を取得 (1件ずつ表示用の行に変換し, モデルは保持しない)
+    reports = ReportService.iter_reports(
         start_date=start_date_obj,
         end_date=end_date_obj,
         template_id=template_id,
@@ -270,30 +291,28 @@ def list_reports(
         limit=limit,
         order_by="date_desc",
     )
+    rows = [
+        (
+            str(r.id),
+            r.get_date() or "不明",
+            r.template.name,
+            r.get_project_name() or "未分類",
+            format_short_datetime(r.created_at),
+        )
+        for r in reports
+    ]
     
-    if not reports:
+    if not rows:
         console.print("[yellow]該当する日報がありません[/yellow]")
         return
     
     # 表形式で表示
-    table = Table(title="日報一覧", show_header=True)
-    table.add_column("ID", style="cyan", width=6)
-    table.add_column("日付", style="green")
-    table.add_column("テンプレート", style="blue")
-    table.add_column("プロジェクト", style="yellow")
-    table.add_column("作成日時", style="dim")
-    
-    for report in reports:
-        table.add_row(
-            str(report.id),
-            report.get_date() or "不明",
-            report.template.name,
-            report.get_project_name() or "未分類",
-            report.created_at.strftime("%m/%d %H:%M"),
-        )
+    table = build_table("日報一覧", _REPORT_COLUMNS)
+    for row in rows:
+        table.add_row(*row)
     
-    console.print(table)
-    console.print(f"\n[dim]表示件数: {len(reports)} 件[/dim]")
+    # 表と件数表示をまとめて1回で出力する
+    console.print(Group(table, f"\n[dim]表示件数: {len(rows)} 件[/dim]"))
 
 
 @app.command("show")
@@ -302,6 +321,8 @@ def show_report(
     report_date: Optional[str] = typer.Option(None, "--date", "-d", help="表示する日報の日付 (YYYY-MM-DD)"),
 ) -> None:
     """日報の詳細を表示."""
+    from smart_nippo.core.services import ReportService
+
     ensure_database()
     
     # 日報を特定
@@ -310,7 +331,7 @@ def show_report(
         report = ReportService.get_report(report_id=report_id)
     elif report_date:
         try:
-            target_date = datetime.strptime(report_date, "%Y-%m-%d").date()
+            target_date = parse_date(report_date)
             report = ReportService.get_report(report_date=target_date)
         except ValueError:
             console.print(f"[red]無効な日付形式です: {report_date}[/red]")
@@ -331,6 +352,8 @@ def show_report(
 
 def _display_report_summary(report) -> None:
     """日報の概要を表示."""
+    from rich.panel import Panel
+
     info_lines = [
         f"[bold]ID:[/bold] {report.id}",
         f"[bold]日付:[/bold] {report.get_date()}",
@@ -342,8 +365,8 @@ def _display_report_summary(report) -> None:
         info_lines.append(f"[bold]プロジェクト:[/bold] {project_name}")
     
     info_lines.extend([
-        f"[bold]作成:[/bold] {report.created_at.strftime('%Y-%m-%d %H:%M')}",
-        f"[bold]更新:[/bold] {report.updated_at.strftime('%Y-%m-%d %H:%M')}",
+        f"[bold]作成:[/bold] {format_datetime(report.created_at)}",
+        f"[bold]更新:[/bold] {format_datetime(report.updated_at)}",
     ])
     
     console.print(Panel("\n".join(info_lines), title="日報情報"))
@@ -351,25 +374,29 @@ def _display_report_summary(report) -> None:
 
 def _display_report_detail(report) -> None:
     """日報の詳細を表示."""
+    from smart_nippo.core.models import FieldType
+
     # 基本情報
     _display_report_summary(report)
     
-    # フィールド別データ表示
-    console.print("\n[bold]日報内容:[/bold]")
+    # フィールド別データ表示 (行ごとに print せず, まとめて1回で出力する)
+    lines = ["\n[bold]日報内容:[/bold]"]
     
-    for field in sorted(report.template.fields, key=lambda f: f.order):
+    # フィールドはサービス層で表示順に並んでいる
+    for field in report.template.fields:
         value = report.data.get(field.name)
         if value is None:
             continue
         
-        # 値の表示形式を調整
-        if field.field_type.value == "memo" and len(str(value)) > 100:
+        # 値の表示形式を調整 (文字列への変換は一度だけ行う)
+        display_value = value if isinstance(value, str) else str(value)
+        if field.field_type is FieldType.MEMO and len(display_value) > 100:
             # 長いメモは折り畳み表示
-            display_value = str(value)[:100] + "..."
-        else:
-            display_value = str(value)
+            display_value = display_value[:100] + "..."
         
-        console.print(f"  [cyan]{field.label}:[/cyan] {display_value}")
+        lines.append(f"  [cyan]{field.label}:[/cyan] {display_value}")
+    
+    console.print("\n".join(lines))
 
 
 @app.command("delete")
@@ -378,6 +405,10 @@ def delete_report(
     force: bool = typer.Option(False, "--force", "-f", help="確認なしで削除"),
 ) -> None:
     """日報を削除."""
+    import questionary
+
+    from smart_nippo.core.services import ReportService
+
     ensure_database()
     
     # 日報の存在確認
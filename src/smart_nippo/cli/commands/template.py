@@ -1,31 +1,115 @@
 """Template management commands."""
 
-import json
-
-import questionary
 import typer
 from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 
-from smart_nippo.core.database import database_exists, init_database
-from smart_nippo.core.models import FieldType, TemplateField
-from smart_nippo.core.services import TemplateService
+from smart_nippo.cli.utils.database import ensure_database
+from smart_nippo.cli.utils.tables import ColumnSpec, build_table, style
 
-console = Console()
+# questionary・rich の表示部品・サービス層 (SQLAlchemy) は読み込みが重いため,
+# 各コマンドの中で必要になった時点でインポートする
+console = Console(highlight=False, emoji=False)
 app = typer.Typer(help="テンプレート管理コマンド")
 
-
-def ensure_database() -> None:
-    """データベースが存在しない場合は初期化."""
-    if not database_exists():
-        init_database()
-        console.print("[green]データベースを初期化しました[/green]")
+_TEMPLATE_COLUMNS: list[ColumnSpec] = [
+    ("ID", {"style": style("cyan"), "width": 6}),
+    ("名前", {"style": style("green")}),
+    ("説明", {"style": style("white")}),
+    ("フィールド数", {"justify": "center"}),
+    ("デフォルト", {"justify": "center"}),
+]
+
+
+def _field_type_is(*types: str):
+    """回答済みのフィールドタイプが指定のいずれかかを判定する関数を返す."""
+    return lambda answers: answers.get("field_type") in types
+
+
+def _has_field_name(answers: dict) -> bool:
+    """フィールド名が入力済みかどうか (空なら以降の質問をスキップ)."""
+    return bool(answers.get("name"))
+
+
+def _validate_max_length(value: str) -> bool | str:
+    """最大文字数の入力を検証."""
+    return not value or value.isdigit() or "数値を入力してください"
+
+
+# create_template で1フィールドごとに行う質問 (questionary.prompt 形式)
+_FIELD_QUESTIONS: list[dict] = [
+    {
+        "type": "text",
+        "name": "name",
+        "message": "  フィールド名 (例: date, project):",
+    },
+    {
+        "type": "text",
+        "name": "label",
+        "message": "  表示ラベル (例: 日付, プロジェクト名):",
+        "when": _has_field_name,
+    },
+    {
+        "type": "select",
+        "name": "field_type",
+        "message": "  フィールドタイプ:",
+        "choices": [
+            {"name": "date - 日付型", "value": "date"},
+            {"name": "time - 時刻型", "value": "time"},
+            {"name": "text - テキスト型（1行）", "value": "text"},
+            {"name": "memo - メモ型（複数行）", "value": "memo"},
+            {"name": "selection - 選択型", "value": "selection"},
+        ],
+        "when": _has_field_name,
+    },
+    {
+        "type": "confirm",
+        "name": "required",
+        "message": "  必須項目にしますか？",
+        "default": True,
+        "when": _has_field_name,
+    },
+    {
+        "type": "text",
+        "name": "default_value",
+        "message": "  デフォルト値 (省略可):",
+        "when": _has_field_name,
+    },
+    {
+        "type": "text",
+        "name": "placeholder",
+        "message": "  プレースホルダー (省略可):",
+        "when": _field_type_is("text", "memo"),
+    },
+    {
+        "type": "text",
+        "name": "max_length",
+        "message": "  最大文字数 (省略可, デフォルト: 255):",
+        "validate": _validate_max_length,
+        "when": _field_type_is("text"),
+    },
+    {
+        "type": "text",
+        "name": "options",
+        "message": "  選択肢を入力 (カンマ区切り, 例: 完了,進行中,未着手):",
+        "when": _field_type_is("selection"),
+    },
+]
+
+_FIELD_COLUMNS: list[ColumnSpec] = [
+    ("#", {"width": 3}),
+    ("名前", {"style": style("cyan")}),
+    ("ラベル", {"style": style("green")}),
+    ("型", {"style": style("yellow")}),
+    ("必須", {"justify": "center"}),
+    ("デフォルト値", {}),
+]
 
 
 @app.command("list")
 def list_templates() -> None:
     """テンプレート一覧を表示."""
+    from smart_nippo.core.services import TemplateService
+
     ensure_database()
 
     templates = TemplateService.list_templates()
@@ -34,12 +118,7 @@ def list_templates() -> None:
         console.print("[yellow]テンプレートが登録されていません[/yellow]")
         return
 
-    table = Table(title="テンプレート一覧", show_header=True)
-    table.add_column("ID", style="cyan", width=6)
-    table.add_column("名前", style="green")
-    table.add_column("説明", style="white")
-    table.add_column("フィールド数", justify="center")
-    table.add_column("デフォルト", justify="center")
+    table = build_table("テンプレート一覧", _TEMPLATE_COLUMNS)
 
     for template in templates:
         is_default = "✓" if template.is_default else ""
@@ -60,6 +139,11 @@ def show_template(
     name: str | None = typer.Option(None, "--name", "-n", help="テンプレート名"),
 ) -> None:
     """テンプレートの詳細を表示."""
+    from rich.panel import Panel
+
+    from smart_nippo.core.models import FieldType
+    from smart_nippo.core.services import TemplateService
+
     ensure_database()
 
     if template_id is None and name is None:
@@ -87,21 +171,16 @@ def show_template(
     console.print(Panel("\n".join(info_lines), title="テンプレート情報"))
 
     # フィールド一覧を表示
-    table = Table(title="フィールド一覧", show_header=True)
-    table.add_column("#", width=3)
-    table.add_column("名前", style="cyan")
-    table.add_column("ラベル", style="green")
-    table.add_column("型", style="yellow")
-    table.add_column("必須", justify="center")
-    table.add_column("デフォルト値")
-
-    for field in sorted(template.fields, key=lambda f: f.order):
+    table = build_table("フィールド一覧", _FIELD_COLUMNS)
+
+    # フィールドはサービス層で表示順に並んでいる
+    for field in template.fields:
         required = "✓" if field.required else ""
         field_type = field.field_type.value
         default = field.default_value or ""
 
         # 選択型の場合は選択肢を表示
-        if field.field_type == FieldType.SELECTION and field.options:
+        if field.field_type is FieldType.SELECTION and field.options:
             field_type = f"{field_type} ({', '.join(field.options)})"
 
         table.add_row(
@@ -122,6 +201,11 @@ def create_template(
                                      help="インタラクティブモードで作成"),
 ) -> None:
     """新しいテンプレートを作成."""
+    import questionary
+
+    from smart_nippo.core.models import FieldType, TemplateField
+    from smart_nippo.core.services import TemplateService
+
     ensure_database()
 
     if not interactive:
@@ -150,72 +234,29 @@ def create_template(
     while True:
         console.print(f"\n[cyan]フィールド {order}:[/cyan]")
 
-        field_name = questionary.text("  フィールド名 (例: date, project):").ask()
+        # フィールド定義の質問をまとめて行う
+        answers = questionary.prompt(_FIELD_QUESTIONS)
+        field_name = answers.get("name")
         if not field_name:
             break
 
-        field_label = questionary.text("  表示ラベル (例: 日付, プロジェクト名):").ask()
-        if not field_label:
-            field_label = field_name
-
-        # フィールドタイプを選択
-        field_type_choices = [
-            {"name": "date - 日付型", "value": "date"},
-            {"name": "time - 時刻型", "value": "time"},
-            {"name": "text - テキスト型（1行）", "value": "text"},
-            {"name": "memo - メモ型（複数行）", "value": "memo"},
-            {"name": "selection - 選択型", "value": "selection"},
-        ]
-        field_type_value = questionary.select(
-            "  フィールドタイプ:",
-            choices=field_type_choices,
-        ).ask()
-        field_type = FieldType(field_type_value)
-
-        # 必須フィールドかどうか
-        required = questionary.confirm("  必須項目にしますか？", default=True).ask()
-
-        # デフォルト値
-        default_value = questionary.text("  デフォルト値 (省略可):").ask() or None
-
-        # プレースホルダー
-        placeholder = None
-        if field_type in [FieldType.TEXT, FieldType.MEMO]:
-            placeholder = questionary.text("  プレースホルダー (省略可):").ask() or None
-
-        # 最大文字数（テキスト型の場合）
-        max_length = None
-        if field_type == FieldType.TEXT:
-            max_length_str = questionary.text(
-                "  最大文字数 (省略可, デフォルト: 255):"
-            ).ask()
-            if max_length_str:
-                try:
-                    max_length = int(max_length_str)
-                except ValueError:
-                    console.print(
-                        "[yellow]    無効な数値です。"
-                        "デフォルト値を使用します[/yellow]"
-                    )
-
-        # 選択肢（選択型の場合）
-        options = None
-        if field_type == FieldType.SELECTION:
-            console.print("  選択肢を入力 (カンマ区切り):")
-            options_str = questionary.text("    例: 完了,進行中,未着手").ask()
-            if options_str:
-                options = [opt.strip() for opt in options_str.split(",")]
+        field_type = FieldType(answers["field_type"])
+        max_length_str = answers.get("max_length")
+        options_str = answers.get("options")
 
         # フィールドを追加
         field = TemplateField(
             name=field_name,
-            label=field_label,
+            label=answers.get("label") or field_name,
             field_type=field_type,
-            required=required,
-            default_value=default_value,
-            options=options,
-            placeholder=placeholder,
-            max_length=max_length,
+            required=answers["required"],
+            default_value=answers.get("default_value") or None,
+            options=(
+                [opt.strip() for opt in options_str.split(",")]
+                if options_str else None
+            ),
+            placeholder=answers.get("placeholder") or None,
+            max_length=int(max_length_str) if max_length_str else None,
             order=order,
         )
         fields.append(field)
@@ -247,6 +288,10 @@ def delete_template(
     force: bool = typer.Option(False, "--force", "-f", help="確認なしで削除"),
 ) -> None:
     """テンプレートを削除."""
+    import questionary
+
+    from smart_nippo.core.services import TemplateService
+
     ensure_database()
 
     template = TemplateService.get_template(template_id)
@@ -278,6 +323,8 @@ def set_default_template(
     template_id: int = typer.Argument(..., help="デフォルトに設定するテンプレートのID"),
 ) -> None:
     """テンプレートをデフォルトに設定."""
+    from smart_nippo.core.services import TemplateService
+
     ensure_database()
 
     try:
@@ -298,6 +345,9 @@ def export_template(
     output: str | None = typer.Option(None, "--output", "-o", help="出力ファイルパス"),
 ) -> None:
     """テンプレートをJSON形式でエクスポート."""
+    from smart_nippo.core import jsonutil
+    from smart_nippo.core.services import TemplateService
+
     ensure_database()
 
     if template_id is None:
@@ -332,19 +382,17 @@ def export_template(
         ],
     }
 
-    json_str = json.dumps(data, ensure_ascii=False, indent=2)
-
     if output:
-        # ファイルに出力
+        # ファイルに出力 (UTF-8 のバイト列をそのまま書き込む)
         try:
-            with open(output, "w", encoding="utf-8") as f:
-                f.write(json_str)
+            with open(output, "wb") as f:
+                f.write(jsonutil.dumps_bytes(data, indent=True))
             console.print(f"[green]✓ テンプレートを {output} に出力しました[/green]")
         except Exception as e:
             console.print(f"[red]ファイル出力エラー: {e}[/red]")
     else:
         # 標準出力に表示
-        console.print(json_str)
+        console.print(jsonutil.dumps(data, indent=True))
 
 
 if __name__ == "__main__":
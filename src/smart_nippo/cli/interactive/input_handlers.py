@@ -1,19 +1,80 @@
 """Interactive input handlers for different field types."""
 
-import tempfile
-import subprocess
-from datetime import datetime, date, timedelta
+import os
+import re
+from datetime import date, time, timedelta
 from pathlib import Path
 from typing import Any
 
 import questionary
 from rich.console import Console
+from rich.text import Text
 
-from smart_nippo.core.config import get_config
+from smart_nippo.core.config import get_config_value
 from smart_nippo.core.models import FieldType, TemplateField
-from smart_nippo.core.validators import validate_report_data
+from smart_nippo.core.validators import parse_date
 
-console = Console()
+console = Console(highlight=False, emoji=False)
+
+# 固定のエラーメッセージは起動時に一度だけ Text 化しておき, 再入力ループで
+# マークアップを毎回解析しないようにする
+_ERR_BAD_DATE = Text("無効な日付形式です。YYYY-MM-DD形式で入力してください。", style="red")
+_ERR_BAD_TIME = Text("無効な時刻形式です。HH:MM形式で入力してください。", style="red")
+_ERR_NO_OPTIONS = Text("選択肢が定義されていません", style="red")
+_ERR_REQUIRED_CANCELLED = Text("必須項目です。入力をキャンセルしました。", style="red")
+
+
+# HH:MM 形式 (時は1桁も可)
+_TIME_PATTERN = re.compile(r"(\d{1,2}):(\d{2})")
+
+
+def _normalize_date(value: str) -> str:
+    """YYYY-MM-DD 形式の日付を検証し, ゼロ埋めして返す (不正な場合は ValueError)."""
+    return parse_date(value).isoformat()
+
+
+def _normalize_time(value: str) -> str:
+    """HH:MM 形式の時刻を検証し, ゼロ埋めして返す (不正な場合は ValueError)."""
+    match = _TIME_PATTERN.fullmatch(value)
+    if not match:
+        raise ValueError(f"無効な時刻形式です: {value}")
+    hour, minute = map(int, match.groups())
+    return time(hour, minute).strftime("%H:%M")
+
+
+# 時 (0-23) ごとの区分ラベル
+_HOUR_LABELS: tuple[str, ...] = tuple(
+    "午前" if hour < 12 else "正午" if hour == 12 else "午後" for hour in range(24)
+)
+
+
+# 15分刻みの時刻選択肢 (毎回生成しないよう読み込み時に一度だけ作成)
+_TIME_CHOICES_15MIN: tuple[questionary.Choice, ...] = tuple(
+    questionary.Choice(
+        f"{hour:02d}:{minute:02d} ({_HOUR_LABELS[hour]})",
+        f"{hour:02d}:{minute:02d}",
+    )
+    for hour in range(24)
+    for minute in (0, 15, 30, 45)
+)
+
+# よく使う時間 (先頭に表示)
+_COMMON_TIME_CHOICES: tuple[questionary.Choice, ...] = tuple(
+    questionary.Choice(label, value)
+    for value, label in (
+        ("09:00", "午前9時 (開始時間)"),
+        ("12:00", "正午 (昼休み)"),
+        ("18:00", "午後6時 (終了時間)"),
+        ("custom", "その他の時刻を入力"),
+    )
+)
+
+# 時刻選択で表示する選択肢一覧 (15分刻みは最初の24個だけ表示)
+_TIME_SELECT_CHOICES: list = [
+    *_COMMON_TIME_CHOICES,
+    questionary.Separator("---"),
+    *_TIME_CHOICES_15MIN[:24],
+]
 
 
 class InputHandler:
@@ -46,31 +107,40 @@ class DateInputHandler(InputHandler):
         """Get date input with calendar-like selection."""
         default_date = self._get_default_date(current_value)
         
-        # カレンダー風の選択肢を提供
+        # カレンダー風の選択肢を提供 (日付文字列は一度だけ整形する)
         today = date.today()
-        yesterday = today - timedelta(days=1)
-        tomorrow = today + timedelta(days=1)
+        today_str = today.isoformat()
+        yesterday_str = (today - timedelta(days=1)).isoformat()
+        tomorrow_str = (today + timedelta(days=1)).isoformat()
         
         choices = [
-            questionary.Choice(f"今日 ({today.strftime('%Y-%m-%d')})", today.strftime('%Y-%m-%d')),
-            questionary.Choice(f"昨日 ({yesterday.strftime('%Y-%m-%d')})", yesterday.strftime('%Y-%m-%d')),
-            questionary.Choice(f"明日 ({tomorrow.strftime('%Y-%m-%d')})", tomorrow.strftime('%Y-%m-%d')),
+            questionary.Choice(f"今日 ({today_str})", today_str),
+            questionary.Choice(f"昨日 ({yesterday_str})", yesterday_str),
+            questionary.Choice(f"明日 ({tomorrow_str})", tomorrow_str),
             questionary.Choice("その他の日付を入力", "custom"),
         ]
+        generated_values = {today_str, yesterday_str, tomorrow_str, "custom"}
+        choice_values = set(generated_values)
         
         # デフォルト値がある場合は選択肢に追加
-        if default_date and default_date not in [today.strftime('%Y-%m-%d'), yesterday.strftime('%Y-%m-%d'), tomorrow.strftime('%Y-%m-%d')]:
+        if default_date and default_date not in choice_values:
             choices.insert(0, questionary.Choice(f"デフォルト ({default_date})", default_date))
+            choice_values.add(default_date)
         
         result = questionary.select(
             f"{self.field.label}:",
             choices=choices,
-            default=default_date if default_date in [c.value for c in choices] else choices[0].value
+            default=default_date if default_date in choice_values else choices[0].value
         ).ask()
         
         if result is None:
             return None
         
+        if result == default_date and result not in generated_values:
+            # 既存値・デフォルト値はまだ検証されていないため, ここで形式を確認する
+            # (不正な場合の ValueError は collect_report_data が入力形式エラーにする)
+            result = _normalize_date(result)
+        
         if result == "custom":
             # 手動入力
             while True:
@@ -87,10 +157,9 @@ class DateInputHandler(InputHandler):
                 
                 try:
                     # 日付形式の検証
-                    datetime.strptime(custom_date, '%Y-%m-%d')
-                    return custom_date
+                    return _normalize_date(custom_date)
                 except ValueError:
-                    console.print("[red]無効な日付形式です。YYYY-MM-DD形式で入力してください。[/red]")
+                    console.print(_ERR_BAD_DATE)
                     continue
         
         return result
@@ -102,11 +171,11 @@ class DateInputHandler(InputHandler):
         
         if self.field.default_value:
             if self.field.default_value == "today":
-                return date.today().strftime('%Y-%m-%d')
+                return date.today().isoformat()
             elif self.field.default_value == "yesterday":
-                return (date.today() - timedelta(days=1)).strftime('%Y-%m-%d')
+                return (date.today() - timedelta(days=1)).isoformat()
             elif self.field.default_value == "tomorrow":
-                return (date.today() + timedelta(days=1)).strftime('%Y-%m-%d')
+                return (date.today() + timedelta(days=1)).isoformat()
             else:
                 return self.field.default_value
         
@@ -118,37 +187,12 @@ class TimeInputHandler(InputHandler):
     
     def get_input(self, current_value: str | None = None) -> str | None:
         """Get time input with 15-minute increments."""
-        # 15分刻みの時刻選択肢を生成
-        time_choices = []
-        for hour in range(24):
-            for minute in [0, 15, 30, 45]:
-                time_str = f"{hour:02d}:{minute:02d}"
-                display_str = f"{time_str}"
-                if hour < 12:
-                    display_str += f" (午前)"
-                elif hour == 12:
-                    display_str += f" (正午)"
-                else:
-                    display_str += f" (午後)"
-                
-                time_choices.append(questionary.Choice(display_str, time_str))
-        
-        # よく使う時間を先頭に追加
-        common_times = [
-            ("09:00", "午前9時 (開始時間)"),
-            ("12:00", "正午 (昼休み)"),
-            ("18:00", "午後6時 (終了時間)"),
-            ("custom", "その他の時刻を入力"),
-        ]
-        
-        common_choices = [questionary.Choice(label, value) for value, label in common_times]
-        
         # デフォルト値を考慮
         default_value = current_value or self.field.default_value
         
         result = questionary.select(
             f"{self.field.label}:",
-            choices=common_choices + [questionary.Choice("---", None)] + time_choices[:24],  # 最初の24個だけ表示
+            choices=_TIME_SELECT_CHOICES,
             default=default_value
         ).ask()
         
@@ -171,10 +215,9 @@ class TimeInputHandler(InputHandler):
                 
                 try:
                     # 時刻形式の検証
-                    datetime.strptime(custom_time, '%H:%M')
-                    return custom_time
+                    return _normalize_time(custom_time)
                 except ValueError:
-                    console.print("[red]無効な時刻形式です。HH:MM形式で入力してください。[/red]")
+                    console.print(_ERR_BAD_TIME)
                     continue
         
         return result
@@ -183,6 +226,17 @@ class TimeInputHandler(InputHandler):
 class TextInputHandler(InputHandler):
     """Handler for text type input."""
     
+    def __init__(self, field: TemplateField):
+        """Initialize text input handler.
+        
+        Args:
+            field: Template field definition
+        """
+        super().__init__(field)
+        # バリデータはキー入力ごとに呼ばれるため, 参照する属性を先に取り出しておく
+        self._required = field.required
+        self._max_length = field.max_length
+    
     def get_input(self, current_value: str | None = None) -> str | None:
         """Get single-line text input."""
         default_value = current_value or self.field.default_value or ""
@@ -203,11 +257,12 @@ class TextInputHandler(InputHandler):
     
     def _validate_text(self, value: str) -> bool | str:
         """Validate text input."""
-        if not value and self.field.required:
+        if not value and self._required:
             return "この項目は必須です"
         
-        if self.field.max_length and len(value) > self.field.max_length:
-            return f"最大{self.field.max_length}文字まで入力できます"
+        max_length = self._max_length
+        if max_length and len(value) > max_length:
+            return f"最大{max_length}文字まで入力できます"
         
         return True
 
@@ -266,18 +321,24 @@ class MemoInputHandler(InputHandler):
     
     def _open_editor(self, current_value: str | None) -> str | None:
         """Open external editor for memo input."""
-        config = get_config()
-        editor_command = config.get("editor.command", "vim")
+        # subprocess と tempfile はエディタ入力時にしか使わないため遅延インポート
+        import subprocess
+        import tempfile
         
-        # 一時ファイルを作成
-        with tempfile.NamedTemporaryFile(mode='w+', suffix='.txt', delete=False) as tmp_file:
-            tmp_path = Path(tmp_file.name)
-            
-            # 既存の値があれば書き込み
-            if current_value:
-                tmp_file.write(current_value)
-            elif self.field.placeholder:
-                tmp_file.write(f"# {self.field.placeholder}\n\n")
+        editor_command = get_config_value("editor.command", "vim")
+        
+        # 一時ファイルを作成し, 既存の値 (なければプレースホルダー) を書き込み
+        if current_value:
+            initial_text = current_value
+        elif self.field.placeholder:
+            initial_text = f"# {self.field.placeholder}\n\n"
+        else:
+            initial_text = ""
+        
+        fd, tmp_name = tempfile.mkstemp(suffix='.txt')
+        tmp_path = Path(tmp_name)
+        with os.fdopen(fd, 'w', encoding='utf-8') as tmp_file:
+            tmp_file.write(initial_text)
         
         try:
             # エディタを起動
@@ -293,13 +354,16 @@ class MemoInputHandler(InputHandler):
                 return current_value
             
             # 編集結果を読み込み
-            with open(tmp_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
+            content = tmp_path.read_text(encoding='utf-8')
             
-            # プレースホルダー行を除去
-            if self.field.placeholder and content.startswith(f"# {self.field.placeholder}"):
-                lines = content.split('\n')
-                content = '\n'.join(lines[2:]).strip()  # 最初の2行（プレースホルダーと空行）を除去
+            # 先頭のプレースホルダー行を除去 (行の分割はせず接頭辞として取り除く.
+            # 末尾に改行のないプレースホルダーだけのファイルも対象にする)
+            if self.field.placeholder:
+                placeholder_line = f"# {self.field.placeholder}"
+                first_line, _, rest = content.partition("\n")
+                if first_line == placeholder_line:
+                    content = rest
+            content = content.strip()
             
             if not content and not self.field.required:
                 return None
@@ -313,8 +377,8 @@ class MemoInputHandler(InputHandler):
         finally:
             # 一時ファイルを削除
             try:
-                tmp_path.unlink()
-            except Exception:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
                 pass
 
 
@@ -324,7 +388,7 @@ class SelectionInputHandler(InputHandler):
     def get_input(self, current_value: str | None = None) -> str | None:
         """Get selection input from predefined options."""
         if not self.field.options:
-            console.print("[red]選択肢が定義されていません[/red]")
+            console.print(_ERR_NO_OPTIONS)
             return None
         
         choices = [questionary.Choice(option, option) for option in self.field.options]
@@ -343,6 +407,16 @@ class SelectionInputHandler(InputHandler):
         return result
 
 
+# フィールドタイプごとの入力ハンドラー
+_HANDLERS: dict[FieldType, type[InputHandler]] = {
+    FieldType.DATE: DateInputHandler,
+    FieldType.TIME: TimeInputHandler,
+    FieldType.TEXT: TextInputHandler,
+    FieldType.MEMO: MemoInputHandler,
+    FieldType.SELECTION: SelectionInputHandler,
+}
+
+
 def get_input_handler(field: TemplateField) -> InputHandler:
     """Get appropriate input handler for field type.
     
@@ -355,15 +429,7 @@ def get_input_handler(field: TemplateField) -> InputHandler:
     Raises:
         ValueError: If field type is not supported
     """
-    handlers = {
-        FieldType.DATE: DateInputHandler,
-        FieldType.TIME: TimeInputHandler,
-        FieldType.TEXT: TextInputHandler,
-        FieldType.MEMO: MemoInputHandler,
-        FieldType.SELECTION: SelectionInputHandler,
-    }
-    
-    handler_class = handlers.get(field.field_type)
+    handler_class = _HANDLERS.get(field.field_type)
     if handler_class is None:
         raise ValueError(f"Unsupported field type: {field.field_type}")
     
@@ -380,21 +446,21 @@ def collect_report_data(template, existing_data: dict | None = None) -> dict[str
     Returns:
         Collected data dict or None if cancelled
     """
-    console.print(f"\n[bold cyan]{template.name}[/bold cyan]")
+    # ヘッダーは一度の出力にまとめる
+    header = f"\n[bold cyan]{template.name}[/bold cyan]"
     if template.description:
-        console.print(f"[dim]{template.description}[/dim]")
-    console.print()
+        header += f"\n[dim]{template.description}[/dim]"
+    console.print(header + "\n")
     
     data = {}
     existing_data = existing_data or {}
     
     # フィールドを順序通りに処理
-    sorted_fields = sorted(template.fields, key=lambda f: f.order)
-    
-    for field in sorted_fields:
-        console.print(f"[bold]{field.order}. {field.label}[/bold]")
+    for field in template.sorted_fields:
+        field_header = f"[bold]{field.order}. {field.label}[/bold]"
         if field.required:
-            console.print("[red]* 必須項目[/red]")
+            field_header += "\n[red]* 必須項目[/red]"
+        console.print(field_header)
         
         # フィールド固有の入力ハンドラーを取得
         handler = get_input_handler(field)
@@ -407,27 +473,19 @@ def collect_report_data(template, existing_data: dict | None = None) -> dict[str
             value = handler.get_input(current_value)
             
             if value is None and field.required:
-                console.print("[red]必須項目です。入力をキャンセルしました。[/red]")
+                console.print(_ERR_REQUIRED_CANCELLED)
                 return None
             
-            # バリデーション
-            if value is not None:
-                # 個別フィールドではなく、全体バリデーションは後で実行
-                # ここでは基本的な型チェックのみ
-                try:
-                    if field.field_type == FieldType.DATE:
-                        datetime.strptime(value, '%Y-%m-%d')
-                    elif field.field_type == FieldType.TIME:
-                        datetime.strptime(value, '%H:%M')
-                except ValueError as e:
-                    console.print(f"[red]入力形式エラー: {e}[/red]")
-                    return None
-            
+            # 日付・時刻の形式は各ハンドラーで検証済みのため, ここでは再検証しない
+            # (全体バリデーションは後で実行)
             data[field.name] = value
             
         except KeyboardInterrupt:
             console.print("\n[yellow]入力がキャンセルされました[/yellow]")
             return None
+        except ValueError as e:
+            console.print(f"[red]入力形式エラー: {e}[/red]")
+            return None
         except Exception as e:
             console.print(f"[red]入力エラー: {e}[/red]")
             return None
@@ -1,7 +1,6 @@
 """Main CLI entry point for smart-nippo"""
 
 import typer
-from rich.console import Console
 
 from smart_nippo.cli.commands.clipboard import clipboard, paste
 from smart_nippo.cli.commands.editor import edit
@@ -14,7 +13,6 @@ app = typer.Typer(
     help="日報入力支援ツール",
     add_completion=False,
 )
-console = Console()
 
 # Add subcommands
 app.command("hello")(hello)
@@ -56,6 +54,10 @@ def callback(
     version: bool = typer.Option(False, "--version", "-v", help="Show version"),
 ) -> None:
     """Main callback for the CLI application."""
+    from rich.console import Console
+
+    console = Console(highlight=False, emoji=False)
+
     if version:
         from smart_nippo import __version__
         console.print(f"smart-nippo version {__version__}")
@@ -65,15 +67,17 @@ def callback(
         console.print(
             "[yellow]No command specified. Use --help for available commands.[/yellow]"
         )
-        console.print("\n[bold]Available commands:[/bold]")
-        console.print("  hello      Hello World コマンド")
-        console.print("  copy       テキストをクリップボードにコピー")
-        console.print("  paste      クリップボードの内容を表示")
-        console.print("  edit       外部エディタを起動して内容を編集")
-        console.print("  create     日報を作成")
-        console.print("  list       日報一覧を表示")
-        console.print("  template   テンプレート管理")
-        console.print("  report     日報管理（詳細コマンド）")
+        console.print(
+            "\n[bold]Available commands:[/bold]\n"
+            "  hello      Hello World コマンド\n"
+            "  copy       テキストをクリップボードにコピー\n"
+            "  paste      クリップボードの内容を表示\n"
+            "  edit       外部エディタを起動して内容を編集\n"
+            "  create     日報を作成\n"
+            "  list       日報一覧を表示\n"
+            "  template   テンプレート管理\n"
+            "  report     日報管理（詳細コマンド）"
+        )
 
 
 def main() -> None:
@@ -0,0 +1,14 @@
+"""Database helpers for CLI commands."""
+
+from rich.console import Console
+
+console = Console(highlight=False, emoji=False)
+
+
+def ensure_database() -> None:
+    """データベースが存在しない場合は初期化."""
+    # サービス層と同様に SQLAlchemy の読み込みはコマンド実行時まで遅らせる
+    from smart_nippo.core.database import ensure_database as _ensure_database
+
+    if _ensure_database():
+        console.print("[green]データベースを初期化しました[/green]")
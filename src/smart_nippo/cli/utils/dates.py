@@ -0,0 +1,21 @@
+"""Date helpers for CLI options and display."""
+
+from datetime import datetime
+
+# 日付の解析はオプション・対話入力・検証で同じ規則を使う
+from smart_nippo.core.validators import parse_date
+
+__all__ = ["format_datetime", "format_short_datetime", "parse_date"]
+
+
+def format_datetime(value: datetime) -> str:
+    """日時を YYYY-MM-DD HH:MM 形式で表示用に整形する."""
+    return (
+        f"{value.year:04d}-{value.month:02d}-{value.day:02d} "
+        f"{value.hour:02d}:{value.minute:02d}"
+    )
+
+
+def format_short_datetime(value: datetime) -> str:
+    """日時を MM/DD HH:MM 形式で表示用に整形する (一覧表示用)."""
+    return f"{value.month:02d}/{value.day:02d} {value.hour:02d}:{value.minute:02d}"
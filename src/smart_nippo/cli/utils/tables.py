@@ -0,0 +1,31 @@
+"""Rich table helpers for CLI commands."""
+
+from typing import Any
+
+from rich.style import Style
+
+# (見出し, add_column のキーワード引数) の組
+ColumnSpec = tuple[str, dict[str, Any]]
+
+
+def style(definition: str) -> Style:
+    """スタイル定義を解析する (列定義をモジュール読み込み時に一度だけ解析するため)."""
+    return Style.parse(definition)
+
+
+def build_table(title: str, columns: list[ColumnSpec]):
+    """列定義から見出し付きの Table を作成.
+
+    Args:
+        title: 表のタイトル
+        columns: 列定義のリスト
+
+    Returns:
+        行が空の rich.table.Table
+    """
+    from rich.table import Table
+
+    table = Table(title=title, show_header=True)
+    for header, options in columns:
+        table.add_column(header, **options)
+    return table
@@ -1,10 +1,11 @@
 """Configuration management for smart-nippo."""
 
 import os
+from functools import cache
+from operator import attrgetter
 from pathlib import Path
 from typing import Any
 
-import yaml
 from pydantic import BaseModel, Field
 
 
@@ -50,9 +51,20 @@ class Config(BaseModel):
     defaults: DefaultsConfig = Field(default_factory=DefaultsConfig)
 
 
+@cache
+def _expand_path(path_str: str, home: str) -> Path:
+    """~ と環境変数を展開したパスを返す (HOME ごとに結果をキャッシュ)."""
+    return Path(os.path.expandvars(os.path.expanduser(path_str)))
+
+
 class ConfigManager:
     """設定管理クラス."""
 
+    # ドット区切りの親キーごとの attrgetter (全インスタンスで共有)
+    _attrgetter_cache: dict[str, attrgetter] = {}
+    # 設定ファイルごとの解析済み設定 ((更新日時, サイズ), 設定) (全インスタンスで共有)
+    _parsed_cache: dict[Path, tuple[tuple[int, int], Config]] = {}
+
     def __init__(self, config_path: str | Path | None = None):
         """
         初期化.
@@ -65,6 +77,8 @@ class ConfigManager:
 
         self.config_path = Path(config_path)
         self._config: Config | None = None
+        # "database.path" のようなドット区切りキーから値を引くための平坦なビュー
+        self._flat: dict[str, Any] = {}
 
     def _get_default_config_path(self) -> Path:
         """デフォルトの設定ファイルパスを取得."""
@@ -77,8 +91,21 @@ class ConfigManager:
         """設定を読み込み."""
         if self._config is None:
             self._config = self._load_from_file()
+            self._flat = self._flatten(self._config)
         return self._config
 
+    @staticmethod
+    def _flatten(model: BaseModel, prefix: str = "") -> dict[str, Any]:
+        """設定モデルをドット区切りキーの辞書に展開 (セクション自体も含む)."""
+        flat: dict[str, Any] = {}
+        for name in type(model).model_fields:
+            value = getattr(model, name)
+            key = f"{prefix}{name}"
+            flat[key] = value
+            if isinstance(value, BaseModel):
+                flat.update(ConfigManager._flatten(value, f"{key}."))
+        return flat
+
     def _load_from_file(self) -> Config:
         """ファイルから設定を読み込み."""
         if not self.config_path.exists():
@@ -87,30 +114,55 @@ class ConfigManager:
             self.save(config)
             return config
 
+        # 設定ファイルが前回から変更されていなければキャッシュを使う
+        stat = self.config_path.stat()
+        cached = self._parsed_cache.get(self.config_path)
+        if cached is not None and cached[0] == (stat.st_mtime_ns, stat.st_size):
+            # 呼び出し側で変更されてもキャッシュに影響しないようコピーを返す
+            return cached[1].model_copy(deep=True)
+
+        # yaml は設定ファイルを読み書きするときだけ必要なので遅延インポート
+        import yaml
+
         try:
+            # libyaml があれば C 実装のローダーを使う
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
             with open(self.config_path, encoding="utf-8") as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=loader)
 
             if data is None:
                 data = {}
 
-            return Config(**data)
+            config = Config(**data)
         except Exception as e:
             raise RuntimeError(f"設定ファイルの読み込みに失敗しました: {e}") from e
 
+        self._remember(stat, config)
+        return config
+
+    def _remember(self, stat: os.stat_result, config: Config) -> None:
+        """解析済みの設定をプロセス内のキャッシュに登録."""
+        self._parsed_cache[self.config_path] = (
+            (stat.st_mtime_ns, stat.st_size),
+            config.model_copy(deep=True),
+        )
+
     def save(self, config: Config | None = None) -> None:
         """設定をファイルに保存."""
         if config is None:
             config = self.load()
 
+        import yaml
+
         # ディレクトリを作成
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
 
         try:
             with open(self.config_path, "w", encoding="utf-8") as f:
-                yaml.safe_dump(
+                yaml.dump(
                     config.model_dump(),
                     f,
+                    Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
                     default_flow_style=False,
                     allow_unicode=True,
                     sort_keys=False,
@@ -118,42 +170,46 @@ class ConfigManager:
         except Exception as e:
             raise RuntimeError(f"設定ファイルの保存に失敗しました: {e}") from e
 
+        self._remember(self.config_path.stat(), config)
+
     def reload(self) -> Config:
         """設定を再読み込み."""
         self._config = None
+        self._parsed_cache.pop(self.config_path, None)
+        _expand_path.cache_clear()
         return self.load()
 
     def get(self, key: str, default: Any = None) -> Any:
-        """設定値を取得."""
-        config = self.load()
-        keys = key.split(".")
+        """設定値を取得.
 
-        value = config
-        for k in keys:
-            if hasattr(value, k):
-                value = getattr(value, k)
-            else:
-                return default
-
-        return value
+        値は読み込み時に作成した平坦なビューから引く。load() で得た設定を
+        直接変更した場合は set() を使うか reload() すること。
+        """
+        self.load()
+        return self._flat.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
         """設定値を設定."""
         config = self.load()
-        keys = key.split(".")
+        parent_key, _, final_key = key.rpartition(".")
 
-        # 最後のキー以外を辿る
+        # 最後のキー以外を辿る (キーごとの attrgetter をキャッシュして再利用)
         target = config
-        for k in keys[:-1]:
-            if hasattr(target, k):
-                target = getattr(target, k)
-            else:
-                raise ValueError(f"設定キー '{key}' が見つかりません")
+        if parent_key:
+            getter = self._attrgetter_cache.get(parent_key)
+            if getter is None:
+                getter = self._attrgetter_cache.setdefault(
+                    parent_key, attrgetter(parent_key)
+                )
+            try:
+                target = getter(config)
+            except AttributeError:
+                raise ValueError(f"設定キー '{key}' が見つかりません") from None
 
         # 最後のキーに値を設定
-        final_key = keys[-1]
         if hasattr(target, final_key):
             setattr(target, final_key, value)
+            self._flat = self._flatten(config)
             self.save(config)
         else:
             raise ValueError(f"設定キー '{key}' が見つかりません")
@@ -163,11 +219,10 @@ class ConfigManager:
         config = self.load()
         path_str = config.database.path
 
-        # 環境変数を展開
-        path_str = os.path.expanduser(path_str)
-        path_str = os.path.expandvars(path_str)
-
-        return Path(path_str)
+        # HOME 以外の環境変数を含む場合は値が変わりうるため毎回展開する
+        if "$" in path_str:
+            return Path(os.path.expandvars(os.path.expanduser(path_str)))
+        return _expand_path(path_str, os.environ.get("HOME", ""))
 
     def get_editor_command(self) -> str:
         """エディタコマンドを取得."""
@@ -198,3 +253,8 @@ def get_config() -> Config:
     manager = get_config_manager()
     return manager.load()
 
+
+def get_config_value(key: str, default: Any = None) -> Any:
+    """ドット区切りキーで設定値を取得する便利関数."""
+    return get_config_manager().get(key, default)
+
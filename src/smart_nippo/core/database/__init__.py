@@ -1,6 +1,13 @@
 """Database layer for smart-nippo."""
 
-from .init import create_tables, database_exists, init_database, reset_database
+from .init import (
+    create_tables,
+    database_exists,
+    ensure_database,
+    init_database,
+    reset_database,
+    upgrade_schema,
+)
 from .models import Base, ProjectDB, ReportDB, TemplateDB, TemplateFieldDB
 from .session import DatabaseManager, get_session
 
@@ -15,6 +22,8 @@ __all__ = [
     "init_database",
     "create_tables",
     "database_exists",
+    "ensure_database",
     "reset_database",
+    "upgrade_schema",
 ]
 
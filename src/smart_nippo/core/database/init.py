@@ -1,11 +1,17 @@
 """Database initialization functions."""
 
-from sqlalchemy import inspect
+from functools import cache
+from typing import Any
+
+from sqlalchemy import insert, inspect, text
 
 from ..models.template import create_default_template
 from .models import Base, TemplateDB, TemplateFieldDB
 from .session import get_database_manager, get_session
 
+# ensure_database() で存在確認済みかどうか (同一プロセス内では結果が変わらない)
+_database_ready = False
+
 
 def create_tables() -> None:
     """全テーブルを作成."""
@@ -14,6 +20,7 @@ def create_tables() -> None:
         raise RuntimeError("データベースエンジンが初期化されていません")
 
     Base.metadata.create_all(bind=manager.engine)
+    manager.clear_table_cache()
 
 
 def init_database() -> None:
@@ -33,37 +40,47 @@ def _create_default_template(session) -> None:
     # Pydanticモデルからデフォルトテンプレートを取得
     template_model = create_default_template()
 
-    # SQLAlchemyモデルに変換
-    template_db = TemplateDB(
-        name=template_model.name,
-        description=template_model.description,
-        is_default=template_model.is_default,
-    )
-
-    session.add(template_db)
-    session.flush()  # IDを取得するためにflush
-
-    # フィールドを追加
-    for field in template_model.fields:
-        field_db = TemplateFieldDB(
-            template_id=template_db.id,
-            name=field.name,
-            label=field.label,
-            field_type=field.field_type.value,
-            required=field.required,
-            default_value=field.default_value,
-            placeholder=field.placeholder,
-            max_length=field.max_length,
-            order=field.order,
+    # テンプレートを挿入し, RETURNING で ID を受け取る (flush を使わない)
+    template_id = session.execute(
+        insert(TemplateDB)
+        .values(
+            name=template_model.name,
+            description=template_model.description,
+            is_default=template_model.is_default,
         )
+        .returning(TemplateDB.id)
+    ).scalar_one()
+
+    # フィールドは1回の executemany でまとめて追加
+    rows = [{**row, "template_id": template_id} for row in _default_field_rows()]
+    # render_nulls: None の列を省略すると列の組み合わせごとに文が分かれるため
+    session.execute(
+        insert(TemplateFieldDB), rows, execution_options={"render_nulls": True}
+    )
 
-        # 選択肢を設定
-        if field.options:
-            field_db.options = field.options
+    session.commit()
 
-        session.add(field_db)
 
-    session.commit()
+@cache
+def _default_field_rows() -> tuple[dict[str, Any], ...]:
+    """デフォルトテンプレートのフィールド行 (template_id 以外) を取得.
+
+    内容は固定のため一度だけ組み立てる.
+    """
+    return tuple(
+        {
+            "name": field.name,
+            "label": field.label,
+            "field_type": field.field_type.value,
+            "required": field.required,
+            "default_value": field.default_value,
+            "options": field.options or None,
+            "placeholder": field.placeholder,
+            "max_length": field.max_length,
+            "order": field.order,
+        }
+        for field in create_default_template().fields
+    )
 
 
 def reset_database() -> None:
@@ -73,6 +90,7 @@ def reset_database() -> None:
         raise RuntimeError("データベースエンジンが初期化されていません")
 
     Base.metadata.drop_all(bind=manager.engine)
+    manager.clear_table_cache()
     init_database()
 
 
@@ -83,12 +101,81 @@ def database_exists() -> bool:
         if manager.engine is None:
             return False
 
-        inspector = inspect(manager.engine)
-        tables = inspector.get_table_names()
-
         # 必要なテーブルがすべて存在するかチェック
         required_tables = {"templates", "template_fields", "projects", "reports"}
-        return required_tables.issubset(set(tables))
+        return required_tables.issubset(manager.table_names())
     except Exception:
         return False
 
+
+
+def upgrade_schema() -> None:
+    """以前のバージョンで作成したデータベースに不足している列・インデックスを追加.
+
+    マイグレーションツールは使っていないため, reports.report_date 列の追加と
+    既存データ (data_json の "date") からの埋め戻しをここで行う.
+
+    以前のバージョンでは同じテンプレート・同じ日付の日報を複数作成できたため,
+    一意インデックスを作成する前に重複を解消する. 重複した日報は ID が最小の
+    ものだけに report_date を設定し, 残りは NULL のままにする (データ自体は
+    変更しないため, 日付の表示は data_json の値で行われる).
+
+    全体を1つのトランザクションで実行し, 途中で失敗した場合は列の追加も
+    取り消す. 列とインデックスの両方がそろっている場合は何もしない.
+    """
+    manager = get_database_manager()
+    if manager.engine is None:
+        raise RuntimeError("データベースエンジンが初期化されていません")
+
+    inspector = inspect(manager.engine)
+    columns = {c["name"] for c in inspector.get_columns("reports")}
+    indexes = {i["name"] for i in inspector.get_indexes("reports")}
+    if "report_date" in columns and "uq_reports_tmpl_date" in indexes:
+        return
+
+    with manager.engine.begin() as conn:
+        # pysqlite は DDL の前に BEGIN を発行しないため, 明示的に開始して
+        # ALTER TABLE もロールバックできるようにする
+        conn.exec_driver_sql("BEGIN")
+        if "report_date" not in columns:
+            conn.execute(text("ALTER TABLE reports ADD COLUMN report_date DATE"))
+        conn.execute(
+            text(
+                "UPDATE reports SET report_date = date(data_json ->> 'date') "
+                "WHERE report_date IS NULL"
+            )
+        )
+        # 同じテンプレート・日付の日報は ID が最小のものだけに日付を残す
+        conn.execute(
+            text(
+                "UPDATE reports SET report_date = NULL "
+                "WHERE report_date IS NOT NULL AND id NOT IN ("
+                "SELECT min(id) FROM reports WHERE report_date IS NOT NULL "
+                "GROUP BY template_id, report_date)"
+            )
+        )
+        # 後から追加したインデックスもまとめて作成
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+
+def ensure_database() -> bool:
+    """データベースが存在しない場合は初期化.
+
+    存在確認はプロセス内で一度だけ行う.
+
+    Returns:
+        今回の呼び出しで初期化した場合は True
+    """
+    global _database_ready
+    if _database_ready:
+        return False
+
+    created = not database_exists()
+    if created:
+        init_database()
+    else:
+        upgrade_schema()
+    _database_ready = True
+    return created
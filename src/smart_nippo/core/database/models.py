@@ -1,37 +1,91 @@
 """SQLAlchemy database models."""
 
-import json
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    TypeDecorator,
+    func,
+    text,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.sql.elements import ColumnElement
+
+from smart_nippo.core import jsonutil
+
+
+class JSONText(TypeDecorator):
+    """JSON を TEXT 列に保存する型.
+
+    SQLite の JSON 関数 (->> など) で扱えるようテキストのまま保存し,
+    読み込み時に一度だけデコードする.
+    """
+
+    impl = Text
+    # 状態を持たないため SQL のコンパイルキャッシュを利用できる
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> str | None:
+        """Python オブジェクトを JSON 文字列に変換."""
+        if value is None:
+            return None
+        return jsonutil.dumps(value)
+
+    def process_result_value(self, value: str | None, dialect) -> Any:
+        """JSON 文字列を Python オブジェクトに変換."""
+        if value is None:
+            return None
+        return jsonutil.loads(value)
+
+    def coerce_compared_value(self, op, value):
+        """比較対象の値は JSON 化せずテキストとして扱う."""
+        return self.impl_instance
 
 
 class Base(DeclarativeBase):
     """データベースモデルのベースクラス."""
-    pass
+
+    # 日時列は SQL 式 (CURRENT_TIMESTAMP) で設定するため,
+    # INSERT/UPDATE 時に RETURNING で値を受け取り後続の SELECT を省く
+    __mapper_args__ = {"eager_defaults": True}
 
 
 class TemplateDB(Base):
     """テンプレートのデータベースモデル."""
 
     __tablename__ = "templates"
+    __table_args__ = (
+        # デフォルトテンプレート (常に1件) の検索用の部分インデックス
+        Index("ix_templates_is_default", "id", sqlite_where=text("is_default = 1")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     is_default: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, nullable=False
+        DateTime, default=func.now(), nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime, default=func.now(), onupdate=func.now(), nullable=False
     )
 
     # Relationships
     fields: Mapped[list["TemplateFieldDB"]] = relationship(
-        "TemplateFieldDB", back_populates="template", cascade="all, delete-orphan"
+        "TemplateFieldDB",
+        back_populates="template",
+        cascade="all, delete-orphan",
+        order_by="TemplateFieldDB.order",
+        # テンプレートを複数取得しても IN 句1回でまとめてフィールドを読み込む
+        lazy="selectin",
     )
     projects: Mapped[list["ProjectDB"]] = relationship(
         "ProjectDB", back_populates="template"
@@ -45,6 +99,10 @@ class TemplateFieldDB(Base):
     """テンプレートフィールドのデータベースモデル."""
 
     __tablename__ = "template_fields"
+    __table_args__ = (
+        # フィールドは常にテンプレート単位で表示順に読み込む
+        Index("ix_template_fields_tmpl_order", "template_id", "order"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     template_id: Mapped[int] = mapped_column(ForeignKey("templates.id"), nullable=False)
@@ -53,7 +111,9 @@ class TemplateFieldDB(Base):
     field_type: Mapped[str] = mapped_column(String(50), nullable=False)
     required: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     default_value: Mapped[str | None] = mapped_column(String(255), nullable=True)
-    options_json: Mapped[str | None] = mapped_column(Text, nullable=True)
+    options: Mapped[list[str] | None] = mapped_column(
+        "options_json", JSONText, nullable=True
+    )
     placeholder: Mapped[str | None] = mapped_column(String(255), nullable=True)
     max_length: Mapped[int | None] = mapped_column(Integer, nullable=True)
     order: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -61,26 +121,12 @@ class TemplateFieldDB(Base):
     # Relationships
     template: Mapped[TemplateDB] = relationship("TemplateDB", back_populates="fields")
 
-    @property
-    def options(self) -> list[str] | None:
-        """選択肢を取得."""
-        if self.options_json:
-            return json.loads(self.options_json)
-        return None
-
-    @options.setter
-    def options(self, value: list[str] | None) -> None:
-        """選択肢を設定."""
-        if value:
-            self.options_json = json.dumps(value, ensure_ascii=False)
-        else:
-            self.options_json = None
-
 
 class ProjectDB(Base):
     """プロジェクトのデータベースモデル."""
 
     __tablename__ = "projects"
+    __table_args__ = (Index("ix_projects_active_name", "is_active", "name"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
@@ -90,7 +136,7 @@ class ProjectDB(Base):
     )
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, nullable=False
+        DateTime, default=func.now(), nullable=False
     )
 
     # Relationships
@@ -106,18 +152,26 @@ class ReportDB(Base):
     """日報のデータベースモデル."""
 
     __tablename__ = "reports"
+    __table_args__ = (
+        Index("ix_reports_tmpl_created", "template_id", "created_at"),
+        Index("ix_reports_project", "project_id"),
+        # 同じテンプレートで同じ日付の日報は1件のみ (NULL 同士は重複扱いしない)
+        Index("uq_reports_tmpl_date", "template_id", "report_date", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     template_id: Mapped[int] = mapped_column(ForeignKey("templates.id"), nullable=False)
     project_id: Mapped[int | None] = mapped_column(
         ForeignKey("projects.id"), nullable=True
     )
-    data_json: Mapped[str] = mapped_column(Text, nullable=False)
+    data: Mapped[dict[str, Any]] = mapped_column("data_json", JSONText, nullable=False)
+    # 日報の日付 (検索・並び替えにも使う). 日付がある場合 data には "date" を保存しない
+    report_date: Mapped[date | None] = mapped_column(Date, nullable=True, index=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, nullable=False
+        DateTime, default=func.now(), nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime, default=func.now(), onupdate=func.now(), nullable=False
     )
 
     # Relationships
@@ -126,15 +180,10 @@ class ReportDB(Base):
         "ProjectDB", back_populates="reports"
     )
 
-    @property
-    def data(self) -> dict[str, Any]:
-        """日報データを取得."""
-        return json.loads(self.data_json)
-
-    @data.setter
-    def data(self, value: dict[str, Any]) -> None:
-        """日報データを設定."""
-        self.data_json = json.dumps(value, ensure_ascii=False)
+    @classmethod
+    def data_field(cls, field_name: str) -> ColumnElement[str]:
+        """日報データ内のフィールド値を表す SQL 式 (SQLite の ->> 演算子)."""
+        return cls.data.op("->>", return_type=String)(field_name)
 
     def get_field_value(self, field_name: str) -> Any:
         """指定されたフィールドの値を取得."""
@@ -142,12 +191,15 @@ class ReportDB(Base):
 
     def set_field_value(self, field_name: str, value: Any) -> None:
         """指定されたフィールドに値を設定."""
-        data = self.data
+        # 変更を検知させるため, 複製した辞書を代入し直す
+        data = dict(self.data)
         data[field_name] = value
         self.data = data
 
     def get_date(self) -> str | None:
         """日付フィールドの値を取得."""
+        if self.report_date is not None:
+            return self.report_date.isoformat()
         return self.get_field_value("date")
 
     def get_project_name(self) -> str | None:
@@ -1,12 +1,41 @@
 """Database session management."""
 
+import os
 from collections.abc import Generator
 from contextlib import contextmanager
+from functools import cache
 from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# データベースファイルのパスを上書きする環境変数 (":memory:" でインメモリ DB)
+DATABASE_PATH_ENV = "SMART_NIPPO_DATABASE_PATH"
+MEMORY_DATABASE = ":memory:"
+
+
+# 接続ごとに設定する SQLite の PRAGMA
+# WAL + synchronous=NORMAL で書き込み時の fsync を減らし,
+# 読み込みは mmap とページキャッシュで受ける
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """新しい SQLite 接続に PRAGMA を設定."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
 
 
 class DatabaseManager:
@@ -26,6 +55,8 @@ class DatabaseManager:
         self.database_path = Path(database_path)
         self.engine: Engine | None = None
         self.SessionLocal: sessionmaker[Session] | None = None
+        # 作成済みテーブル名のキャッシュ (テーブルを作成・削除したら破棄する)
+        self._table_names: set[str] | None = None
 
     def _get_default_database_path(self) -> Path:
         """デフォルトのデータベースパスを取得."""
@@ -34,24 +65,41 @@ class DatabaseManager:
         smart_nippo_dir.mkdir(exist_ok=True)
         return smart_nippo_dir / "data.db"
 
+    @property
+    def in_memory(self) -> bool:
+        """インメモリデータベースかどうか."""
+        return str(self.database_path) == MEMORY_DATABASE
+
     def initialize(self) -> None:
         """データベースエンジンとセッションを初期化."""
-        # データベースディレクトリを作成
-        self.database_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # SQLiteエンジンを作成
-        database_url = f"sqlite:///{self.database_path}"
-        self.engine = create_engine(
-            database_url,
-            echo=False,  # SQLログの表示（開発時はTrue）
-            pool_pre_ping=True,  # 接続の事前チェック
-        )
+        if self.in_memory:
+            # 接続ごとに別の DB にならないよう, 1つの接続を使い回す
+            self.engine = create_engine(
+                "sqlite://",
+                echo=False,
+                connect_args={"check_same_thread": False},
+                poolclass=StaticPool,
+            )
+        else:
+            # データベースディレクトリを作成
+            self.database_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # SQLiteエンジンを作成
+            database_url = f"sqlite:///{self.database_path}"
+            self.engine = create_engine(
+                database_url,
+                echo=False,  # SQLログの表示（開発時はTrue）
+                pool_pre_ping=True,  # 接続の事前チェック
+            )
+        event.listen(self.engine, "connect", _set_sqlite_pragmas)
 
         # セッションファクトリを作成
         self.SessionLocal = sessionmaker(
             bind=self.engine,
             autocommit=False,
             autoflush=False,
+            # コミット後に属性を再読み込みする SELECT を発行しない
+            expire_on_commit=False,
         )
 
     @contextmanager
@@ -74,23 +122,39 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def table_names(self) -> set[str]:
+        """作成済みのテーブル名を取得.
+
+        sqlite_master への問い合わせは初回のみ行い, 結果を保持する.
+        """
+        if self.engine is None:
+            raise RuntimeError("データベースエンジンが初期化されていません")
+        if self._table_names is None:
+            self._table_names = set(inspect(self.engine).get_table_names())
+        return self._table_names
+
+    def clear_table_cache(self) -> None:
+        """テーブル名のキャッシュを破棄."""
+        self._table_names = None
+
     def close(self) -> None:
         """データベース接続を閉じる."""
         if self.engine:
             self.engine.dispose()
+        self._table_names = None
 
 
-# グローバルなデータベースマネージャーインスタンス
-_database_manager: DatabaseManager | None = None
-
-
+@cache
 def get_database_manager() -> DatabaseManager:
-    """グローバルなデータベースマネージャーを取得."""
-    global _database_manager
-    if _database_manager is None:
-        _database_manager = DatabaseManager()
-        _database_manager.initialize()
-    return _database_manager
+    """グローバルなデータベースマネージャーを取得.
+
+    初回呼び出し時に生成・初期化し, 以降は同じインスタンスを返す.
+    作り直す場合は ``get_database_manager.cache_clear()`` を呼ぶ.
+    環境変数 SMART_NIPPO_DATABASE_PATH が設定されていればそのパスを使う.
+    """
+    manager = DatabaseManager(os.environ.get(DATABASE_PATH_ENV) or None)
+    manager.initialize()
+    return manager
 
 
 @contextmanager
@@ -0,0 +1,62 @@
+"""JSON serialization helpers.
+
+orjson がインストールされていればそれを使い, なければ標準ライブラリの json を使う.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson は任意依存
+    orjson = None
+
+
+def dumps_bytes(obj: Any, *, indent: bool = False) -> bytes:
+    """オブジェクトを UTF-8 の JSON バイト列に変換.
+
+    Args:
+        obj: 変換するオブジェクト
+        indent: 2スペースでインデントするか
+
+    Returns:
+        JSON バイト列
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return dumps(obj, indent=indent).encode("utf-8")
+
+
+def dumps(obj: Any, *, indent: bool = False) -> str:
+    """オブジェクトを JSON 文字列に変換 (非 ASCII 文字はエスケープしない).
+
+    Args:
+        obj: 変換するオブジェクト
+        indent: 2スペースでインデントするか
+
+    Returns:
+        JSON 文字列
+    """
+    if orjson is not None:
+        return dumps_bytes(obj, indent=indent).decode("utf-8")
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    # orjson と同じく区切り文字の空白を入れない
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads(data: str | bytes) -> Any:
+    """JSON 文字列 (またはバイト列) をオブジェクトに変換.
+
+    Args:
+        data: JSON 文字列またはバイト列
+
+    Returns:
+        変換したオブジェクト
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,12 +1,24 @@
 """Core models for smart-nippo."""
 
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from .field_types import DateDefault, FieldType
-from .project import Project
-from .report import Report
-from .template import Template, TemplateField
 
-# Initialize models and resolve forward references
-from ._init_models import init_models
+if TYPE_CHECKING:
+    # 型チェッカー向けの静的な import (実行時は __getattr__ で遅延読み込みする)
+    from .project import Project
+    from .report import Report
+    from .template import Template, TemplateField
+
+# pydantic モデルは初回参照時に読み込む (PEP 562)
+# フィールドタイプだけを使う処理では pydantic の import とモデル構築を省ける
+_LAZY_MODELS = {
+    "TemplateField": ".template",
+    "Template": ".template",
+    "Report": ".report",
+    "Project": ".project",
+}
 
 __all__ = [
     "FieldType",
@@ -16,3 +28,23 @@ __all__ = [
     "Report",
     "Project",
 ]
+
+
+def __getattr__(name: str):
+    """モデルクラスを遅延読み込みする."""
+    module_name = _LAZY_MODELS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # Initialize models and resolve forward references
+    from ._init_models import init_models
+
+    init_models()
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """遅延読み込みするモデルも含めた属性名の一覧."""
+    return sorted(set(globals()) | set(_LAZY_MODELS))
@@ -1,12 +1,18 @@
 """Initialize models and resolve forward references."""
 
+# 前方参照の解決が済んでいるかどうか
+_initialized = False
+
+
 def init_models():
     """Initialize models and resolve forward references."""
+    global _initialized
+    if _initialized:
+        return
+
     from .template import Template
     from .report import Report
     
     # Rebuild models to resolve forward references
     Report.model_rebuild()
-
-# Call initialization
-init_models()
\ No newline at end of file
+    _initialized = True
@@ -1,10 +1,13 @@
 """Field type definitions for report templates."""
 
-from enum import Enum
+from enum import StrEnum
 
 
-class FieldType(Enum):
-    """入力フィールドの型定義."""
+class FieldType(StrEnum):
+    """入力フィールドの型定義.
+
+    StrEnum のため値の文字列とそのまま比較できる.
+    """
 
     DATE = "date"              # 日付型
     TIME = "time"              # 時刻型
@@ -13,7 +16,7 @@ class FieldType(Enum):
     SELECTION = "selection"    # 選択型
 
 
-class DateDefault(Enum):
+class DateDefault(StrEnum):
     """日付型のデフォルト値の種類."""
 
     TODAY = "today"            # 当日
@@ -1,8 +1,16 @@
 """Template models for report creation."""
 
 from datetime import datetime
+from functools import cache, cached_property
+from operator import attrgetter
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import (
+    BaseModel,
+    Field,
+    ValidationInfo,
+    field_validator,
+    model_validator,
+)
 
 from .field_types import DateDefault, FieldType
 
@@ -20,21 +28,28 @@ class TemplateField(BaseModel):
     max_length: int | None = Field(None, description="最大文字数（text型の場合）")
     order: int = Field(0, description="表示順序")
 
+    @field_validator("max_length")
+    @classmethod
+    def validate_text_max_length(cls, value: int | None, info: ValidationInfo):
+        """テキスト型の最大文字数をチェック.
+
+        max_length が指定された場合のみ呼ばれる.
+        """
+        if (
+            value
+            and value > 255
+            and info.data.get("field_type") is FieldType.TEXT
+        ):
+            raise ValueError("text型の最大文字数は255文字です")
+        return value
+
     @model_validator(mode="after")
     def validate_field_type_constraints(self):
         """フィールドタイプに応じた制約をチェック."""
         # 選択型の場合は選択肢が必須
-        if self.field_type == FieldType.SELECTION and not self.options:
+        if self.field_type is FieldType.SELECTION and not self.options:
             raise ValueError("selection型には選択肢（options）が必要です")
 
-        # テキスト型の最大文字数チェック
-        if (
-            self.field_type == FieldType.TEXT
-            and self.max_length
-            and self.max_length > 255
-        ):
-            raise ValueError("text型の最大文字数は255文字です")
-
         return self
 
 
@@ -57,9 +72,28 @@ class Template(BaseModel):
             raise ValueError("フィールド名が重複しています")
         return self
 
+    @cached_property
+    def sorted_fields(self) -> list[TemplateField]:
+        """表示順に並べたフィールドのリスト.
+
+        初回参照時に一度だけソートする。fields を変更した場合は
+        ``del template.sorted_fields`` でキャッシュを破棄すること。
+        """
+        return sorted(self.fields, key=attrgetter("order"))
+
 
 def create_default_template() -> Template:
-    """デフォルトテンプレートを作成."""
+    """デフォルトテンプレートを作成.
+
+    内容は固定のため構築は初回呼び出し時の一度だけとし, 呼び出し側で変更しても
+    影響が出ないよう毎回その複製を返す.
+    """
+    return _build_default_template().model_copy(deep=True)
+
+
+@cache
+def _build_default_template() -> Template:
+    """デフォルトテンプレートを構築 (共有インスタンスのため変更しないこと)."""
     fields = [
         TemplateField(
             name="date",
@@ -1,16 +1,73 @@
 """Report management service."""
 
 from datetime import datetime, date, timedelta
+from collections.abc import Iterator
+from operator import attrgetter
 from typing import Any
 
-from sqlalchemy import and_, or_, desc, asc
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, func, insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
 
 from ..database import ReportDB, TemplateDB, get_session
 from ..models import Report, Template
+from ..validators import parse_date
 from .template_service import TemplateService
 
 
+# iter_reports で1回にデータベースから読み込む件数
+_YIELD_PER = 500
+
+
+def _with_template(query):
+    """テンプレートとそのフィールドを一括で読み込むオプションを付与.
+
+    日報ごとに ``report_db.template`` を遅延読み込みすると N+1 クエリになるため,
+    一覧系の取得では必ずこれを通す.
+    """
+    return query.options(
+        selectinload(ReportDB.template).selectinload(TemplateDB.fields)
+    )
+
+
+def _parse_report_date(data: dict[str, Any]) -> date | None:
+    """日報データの "date" を date に変換 (ない場合は None).
+
+    形式は入力時の検証と同じ規則で解釈し, 不正な場合は黙って別の日付に
+    しないよう ValueError にする.
+    """
+    value = data.get("date")
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value
+    if not isinstance(value, str):
+        raise ValueError(f"無効な日付形式です: {value}")
+    return parse_date(value)
+
+
+def _resolve_report_date(
+    data: dict[str, Any], report_date: date | None = None
+) -> tuple[date, dict[str, Any]]:
+    """保存する日報の日付と, "date" を除いた日報データを返す.
+
+    日付は引数 → データの "date" → 今日の順に決める (形式が不正な場合は ValueError).
+    create_report と create_reports で同じ行を保存するため, 両方からこれを通す.
+    """
+    if report_date is None:
+        report_date = _parse_report_date(data) or date.today()
+    return report_date, _without_date(data)
+
+
+def _without_date(data: dict[str, Any]) -> dict[str, Any]:
+    """保存用に "date" を除いた日報データを返す.
+
+    日付は report_date 列に保存し, 取得時に _db_to_model で data に戻す.
+    """
+    return {key: value for key, value in data.items() if key != "date"}
+
+
 class ReportService:
     """日報管理サービス."""
     
@@ -26,13 +83,14 @@ class ReportService:
         Args:
             template_id: 使用するテンプレートのID
             data: 日報データ
-            report_date: 日報の日付（省略時は今日）
+            report_date: 日報の日付（省略時はデータの "date", それもなければ今日）
             
         Returns:
             作成された日報
             
         Raises:
-            ValueError: テンプレートが見つからない場合
+            ValueError: テンプレートが見つからない場合, データの日付の形式が不正な場合,
+                同じ日付の日報が既に存在する場合
         """
         with get_session() as session:
             # テンプレートの存在確認
@@ -40,40 +98,82 @@ class ReportService:
             if not template_db:
                 raise ValueError(f"テンプレートID {template_id} が見つかりません")
             
-            # 日報の日付を決定
-            if report_date is None:
-                # データから日付を取得を試行
-                if "date" in data and data["date"]:
-                    try:
-                        report_date = datetime.strptime(data["date"], "%Y-%m-%d").date()
-                    except (ValueError, TypeError):
-                        report_date = date.today()
-                else:
-                    report_date = date.today()
-            
-            # 同じ日付の日報が既に存在するかチェック
-            date_str = report_date.strftime("%Y-%m-%d")
-            existing_report = session.query(ReportDB).filter(
-                and_(
-                    ReportDB.template_id == template_id,
-                    ReportDB.data_json.op("->>")("date") == date_str
-                )
-            ).first()
-            
-            if existing_report:
-                raise ValueError(f"{report_date.strftime('%Y-%m-%d')} の日報は既に存在します")
+            # 日報の日付を決定 (日付は report_date 列だけに保存する)
+            report_date, data = _resolve_report_date(data, report_date)
             
-            # 日報を作成
-            report_db = ReportDB(
-                template_id=template_id,
-                data=data,
+            # 日報を作成 (同じ日付の重複は一意インデックスの衝突として検出し,
+            # 事前の SELECT は行わない)
+            stmt = (
+                sqlite_insert(ReportDB)
+                .values(template_id=template_id, data=data, report_date=report_date)
+                .on_conflict_do_nothing(index_elements=["template_id", "report_date"])
+                .returning(ReportDB)
             )
-            session.add(report_db)
+            report_db = session.scalars(stmt).first()
+            if report_db is None:
+                raise ValueError(f"{report_date.isoformat()} の日報は既に存在します")
             session.commit()
             
             # Pydanticモデルに変換して返す
             return ReportService._db_to_model(report_db, template_db)
     
+    @staticmethod
+    def create_reports(
+        template_id: int,
+        data_list: list[dict[str, Any]],
+    ) -> list[Report]:
+        """
+        同じテンプレートの日報をまとめて作成.
+        
+        1回の INSERT (executemany) と1回のコミットで全件を追加する.
+        日報の日付は create_report と同じく各データの "date" (なければ今日) で決める.
+        
+        Args:
+            template_id: 使用するテンプレートのID
+            data_list: 日報データのリスト
+            
+        Returns:
+            作成された日報のリスト（data_list と同じ順）
+            
+        Raises:
+            ValueError: テンプレートが見つからない場合, データの日付の形式が不正な場合,
+                同じ日付の日報が既に存在する場合
+        """
+        if not data_list:
+            return []
+        
+        with get_session() as session:
+            # テンプレートの存在確認
+            template_db = session.query(TemplateDB).filter_by(id=template_id).first()
+            if not template_db:
+                raise ValueError(f"テンプレートID {template_id} が見つかりません")
+            
+            rows = []
+            for data in data_list:
+                report_date, data = _resolve_report_date(data)
+                rows.append(
+                    {
+                        "template_id": template_id,
+                        "data": data,
+                        "report_date": report_date,
+                    }
+                )
+            
+            # sort_by_parameter_order を指定すると SQLite では1行ずつの INSERT に
+            # なるため, 挿入順に振られる ID で並べ直す
+            stmt = insert(ReportDB).returning(ReportDB)
+            try:
+                reports_db = sorted(session.scalars(stmt, rows), key=attrgetter("id"))
+                session.commit()
+            except IntegrityError:
+                raise ValueError("同じ日付の日報が既に存在します") from None
+            
+            template_cache: dict[int, Template] = {}
+            return [
+                ReportService._db_to_model(report_db, template_db, template_cache)
+                for report_db in reports_db
+            ]
+    
     @staticmethod
     def get_report(
         report_id: int | None = None,
@@ -92,22 +192,21 @@ class ReportService:
             日報（見つからない場合はNone）
         """
         with get_session() as session:
-            query = session.query(ReportDB).join(TemplateDB)
+            query = _with_template(session.query(ReportDB))
             
             if report_id is not None:
                 report_db = query.filter(ReportDB.id == report_id).first()
             elif report_date is not None:
-                date_str = report_date.strftime("%Y-%m-%d")
                 if template_id is not None:
                     report_db = query.filter(
                         and_(
                             ReportDB.template_id == template_id,
-                            ReportDB.data_json.op("->>")("date") == date_str
+                            ReportDB.report_date == report_date
                         )
                     ).first()
                 else:
                     # テンプレート指定がない場合は該当日の日報を検索
-                    reports = query.filter(ReportDB.data_json.op("->>")("date") == date_str).all()
+                    reports = query.filter(ReportDB.report_date == report_date).all()
                     if len(reports) == 1:
                         report_db = reports[0]
                     elif len(reports) > 1:
@@ -143,7 +242,8 @@ class ReportService:
             更新された日報
             
         Raises:
-            ValueError: 日報が見つからない場合
+            ValueError: 日報が見つからない場合, データの日付の形式が不正な場合,
+                変更先の日付の日報が既に存在する場合
         """
         with get_session() as session:
             report_db = session.query(ReportDB).filter_by(id=report_id).first()
@@ -151,11 +251,21 @@ class ReportService:
                 raise ValueError(f"日報ID {report_id} が見つかりません")
             
             # データの更新
+            new_date = None
             if data is not None:
+                # データに日付があれば日報の日付を更新し, data からは除く
+                new_date = _parse_report_date(data)
+                if new_date is not None:
+                    report_db.report_date = new_date
+                    data = _without_date(data)
                 report_db.data = data
                 report_db.updated_at = datetime.now()
             
-            session.commit()
+            try:
+                session.commit()
+            except IntegrityError:
+                # 一意インデックスに触れるのは日付を変更した場合だけ
+                raise ValueError(f"{new_date} の日報は既に存在します") from None
             return ReportService._db_to_model(report_db, report_db.template)
     
     @staticmethod
@@ -191,6 +301,40 @@ class ReportService:
         """
         日報一覧を取得.
         
+        引数は iter_reports と同じ. 結果を何度も参照しない場合は
+        iter_reports を使う方がメモリ効率がよい.
+        
+        Returns:
+            日報リスト
+        """
+        return list(
+            ReportService.iter_reports(
+                start_date=start_date,
+                end_date=end_date,
+                template_id=template_id,
+                project_name=project_name,
+                keyword=keyword,
+                limit=limit,
+                order_by=order_by,
+            )
+        )
+    
+    @staticmethod
+    def iter_reports(
+        start_date: date | None = None,
+        end_date: date | None = None,
+        template_id: int | None = None,
+        project_name: str | None = None,
+        keyword: str | None = None,
+        limit: int | None = None,
+        order_by: str = "date_desc",
+    ) -> Iterator[Report]:
+        """
+        日報を1件ずつ取得.
+        
+        データベースからは一定件数ずつ読み込むため, 件数が多くても
+        全件分の ORM オブジェクトと Pydantic モデルを同時に保持しない.
+        
         Args:
             start_date: 開始日（含む）
             end_date: 終了日（含む）
@@ -200,20 +344,18 @@ class ReportService:
             limit: 取得件数制限
             order_by: ソート順 ("date_asc", "date_desc", "created_asc", "created_desc")
             
-        Returns:
-            日報リスト
+        Yields:
+            日報
         """
         with get_session() as session:
-            query = session.query(ReportDB).join(TemplateDB)
+            query = _with_template(session.query(ReportDB))
             
             # 日付範囲フィルタ
             if start_date:
-                start_str = start_date.strftime("%Y-%m-%d")
-                query = query.filter(ReportDB.data_json.op("->>")("date") >= start_str)
+                query = query.filter(ReportDB.report_date >= start_date)
             
             if end_date:
-                end_str = end_date.strftime("%Y-%m-%d")
-                query = query.filter(ReportDB.data_json.op("->>")("date") <= end_str)
+                query = query.filter(ReportDB.report_date <= end_date)
             
             # テンプレートフィルタ
             if template_id:
@@ -222,7 +364,7 @@ class ReportService:
             # プロジェクト名フィルタ
             if project_name:
                 query = query.filter(
-                    ReportDB.data_json.op("->>")("project").ilike(f"%{project_name}%")
+                    ReportDB.data_field("project").ilike(f"%{project_name}%")
                 )
             
             # キーワード検索
@@ -231,29 +373,31 @@ class ReportService:
                 search_conditions = []
                 for key in ["content", "issues", "tomorrow_plan", "notes"]:
                     search_conditions.append(
-                        ReportDB.data_json.op("->>")(key).ilike(f"%{keyword}%")
+                        ReportDB.data_field(key).ilike(f"%{keyword}%")
                     )
                 query = query.filter(or_(*search_conditions))
             
             # ソート
             if order_by == "date_asc":
-                query = query.order_by(asc(ReportDB.data_json.op("->>")("date")))
+                query = query.order_by(ReportDB.report_date.asc())
             elif order_by == "date_desc":
-                query = query.order_by(desc(ReportDB.data_json.op("->>")("date")))
+                query = query.order_by(ReportDB.report_date.desc())
+            # created_at は秒単位のため, 同じ秒に作成した日報は ID で並べる
             elif order_by == "created_asc":
-                query = query.order_by(asc(ReportDB.created_at))
+                query = query.order_by(ReportDB.created_at.asc(), ReportDB.id.asc())
             elif order_by == "created_desc":
-                query = query.order_by(desc(ReportDB.created_at))
+                query = query.order_by(ReportDB.created_at.desc(), ReportDB.id.desc())
             
             # 件数制限
             if limit:
                 query = query.limit(limit)
             
-            reports_db = query.all()
-            return [
-                ReportService._db_to_model(report_db, report_db.template)
-                for report_db in reports_db
-            ]
+            # 同じテンプレートの変換は一覧内で1回にまとめる
+            template_cache: dict[int, Template] = {}
+            for report_db in query.yield_per(_YIELD_PER):
+                yield ReportService._db_to_model(
+                    report_db, report_db.template, template_cache
+                )
     
     @staticmethod
     def get_report_by_date_range(
@@ -298,16 +442,38 @@ class ReportService:
         )
     
     @staticmethod
-    def _db_to_model(report_db: ReportDB, template_db: TemplateDB) -> Report:
-        """データベースモデルをPydanticモデルに変換."""
+    def _db_to_model(
+        report_db: ReportDB,
+        template_db: TemplateDB,
+        template_cache: dict[int, Template] | None = None,
+    ) -> Report:
+        """データベースモデルをPydanticモデルに変換.
+
+        Args:
+            report_db: 日報のデータベースモデル
+            template_db: テンプレートのデータベースモデル
+            template_cache: 変換済みテンプレートのキャッシュ (テンプレートID → モデル).
+                一覧取得時に同じテンプレートを何度も変換しないために使う
+        """
         # テンプレートを変換
-        template = TemplateService._db_to_model(template_db)
+        if template_cache is None:
+            template = TemplateService._db_to_model(template_db)
+        else:
+            template = template_cache.get(template_db.id)
+            if template is None:
+                template = TemplateService._db_to_model(template_db)
+                template_cache[template_db.id] = template
+        
+        # 日付は report_date 列から data に戻す
+        data = report_db.data
+        if report_db.report_date is not None:
+            data = {**data, "date": report_db.report_date.isoformat()}
         
         return Report(
             id=report_db.id,
             template_id=report_db.template_id,
             template=template,
-            data=report_db.data,
+            data=data,
             created_at=report_db.created_at,
             updated_at=report_db.updated_at,
         )
@@ -364,41 +530,43 @@ class ReportService:
         Returns:
             統計情報辞書
         """
-        reports = ReportService.list_reports(
-            start_date=start_date,
-            end_date=end_date
-        )
-        
-        if not reports:
-            return {
-                "total_reports": 0,
-                "date_range": {
-                    "start": start_date,
-                    "end": end_date,
-                },
-                "templates_used": {},
-                "projects": {},
-            }
-        
-        # 基本統計
-        templates_used = {}
-        projects = {}
-        
-        for report in reports:
+        with get_session() as session:
+            # 日付範囲の条件 (両方の集計で共通)
+            conditions = []
+            if start_date:
+                conditions.append(ReportDB.report_date >= start_date)
+            if end_date:
+                conditions.append(ReportDB.report_date <= end_date)
+            
             # テンプレート使用統計
-            template_name = report.template.name
-            templates_used[template_name] = templates_used.get(template_name, 0) + 1
+            templates_used: dict[str, int] = {}
+            template_rows = (
+                session.query(TemplateDB.name, func.count(ReportDB.id))
+                .join(ReportDB, ReportDB.template_id == TemplateDB.id)
+                .filter(*conditions)
+                .group_by(TemplateDB.name)
+            )
+            for template_name, count in template_rows:
+                templates_used[template_name] = count
             
-            # プロジェクト統計
-            project_name = report.get_project_name() or "未分類"
-            projects[project_name] = projects.get(project_name, 0) + 1
+            # プロジェクト統計 (プロジェクト名が空の日報は「未分類」にまとめる)
+            projects: dict[str, int] = {}
+            project = ReportDB.data_field("project")
+            project_rows = (
+                session.query(project, func.count(ReportDB.id))
+                .filter(*conditions)
+                .group_by(project)
+            )
+            for project_name, count in project_rows:
+                key = project_name or "未分類"
+                projects[key] = projects.get(key, 0) + count
         
         return {
-            "total_reports": len(reports),
+            "total_reports": sum(templates_used.values()),
             "date_range": {
                 "start": start_date,
                 "end": end_date,
             },
             "templates_used": templates_used,
             "projects": projects,
-        }
\ No newline at end of file
+        }
@@ -1,10 +1,36 @@
 """Template management service."""
 
-
+from sqlalchemy import delete, event, func, insert, or_, select, update
+from sqlalchemy.orm import Session
 
 from ..database import TemplateDB, TemplateFieldDB, get_session
 from ..models import FieldType, Template, TemplateField
 
+# 取得済みテンプレートのキャッシュ (テンプレートID → モデル).
+# テンプレートは読み込みが多く更新が少ないため, 更新系のメソッドでまとめて破棄する.
+# 呼び出し側の変更がキャッシュに及ばないよう, 登録時と取り出し時に複製する
+_tmpl_cache: dict[int, Template] = {}
+# 更新のたびに増える世代番号 (読み込み中に更新された結果をキャッシュしないため)
+_tmpl_gen = 0
+
+
+def _invalidate_cache(*_args: object, **_kwargs: object) -> None:
+    """テンプレートのキャッシュを破棄."""
+    global _tmpl_gen
+    _tmpl_gen += 1
+    _tmpl_cache.clear()
+
+
+def _cache_template(template: Template, generation: int) -> Template:
+    """読み込み開始時から更新がなければテンプレートをキャッシュに登録."""
+    if generation == _tmpl_gen and template.id is not None:
+        _tmpl_cache[template.id] = template.model_copy(deep=True)
+    return template
+
+
+# reset_database などでテーブルが作り直された場合もキャッシュを破棄する
+event.listen(TemplateDB.__table__, "after_drop", _invalidate_cache)
+
 
 class TemplateService:
     """テンプレート管理サービス."""
@@ -37,40 +63,24 @@ class TemplateService:
             if existing:
                 raise ValueError(f"テンプレート名 '{name}' は既に存在します")
 
-            # デフォルトテンプレートの処理
-            if is_default:
-                # 既存のデフォルトを解除
-                session.query(TemplateDB).filter_by(is_default=True).update(
-                    {"is_default": False}
-                )
-
             # テンプレートを作成
             template_db = TemplateDB(
                 name=name,
                 description=description,
-                is_default=is_default,
+                is_default=False,
             )
             session.add(template_db)
             session.flush()
 
-            # フィールドを追加
-            for field in fields:
-                field_db = TemplateFieldDB(
-                    template_id=template_db.id,
-                    name=field.name,
-                    label=field.label,
-                    field_type=field.field_type.value,
-                    required=field.required,
-                    default_value=field.default_value,
-                    placeholder=field.placeholder,
-                    max_length=field.max_length,
-                    order=field.order,
-                )
-                if field.options:
-                    field_db.options = field.options
-                session.add(field_db)
+            # デフォルトテンプレートの処理
+            if is_default:
+                TemplateService._set_default(session, template_db.id)
+
+            # フィールドを1回の executemany でまとめて追加
+            TemplateService._insert_fields(session, template_db.id, fields)
 
             session.commit()
+            _invalidate_cache()
 
             # Pydanticモデルに変換して返す
             return TemplateService._db_to_model(template_db)
@@ -89,27 +99,42 @@ class TemplateService:
         Returns:
             テンプレート（見つからない場合はNone）
         """
+        if template_id is not None:
+            cached = _tmpl_cache.get(template_id)
+            if cached is not None:
+                return cached.model_copy(deep=True)
+        elif name is None:
+            return None
+
+        generation = _tmpl_gen
         with get_session() as session:
             query = session.query(TemplateDB)
 
             if template_id is not None:
                 template_db = query.filter_by(id=template_id).first()
-            elif name is not None:
-                template_db = query.filter_by(name=name).first()
             else:
-                return None
+                template_db = query.filter_by(name=name).first()
 
             if template_db:
-                return TemplateService._db_to_model(template_db)
+                return _cache_template(
+                    TemplateService._db_to_model(template_db), generation
+                )
             return None
 
     @staticmethod
     def get_default_template() -> Template | None:
         """デフォルトテンプレートを取得."""
+        for template in _tmpl_cache.values():
+            if template.is_default:
+                return template.model_copy(deep=True)
+
+        generation = _tmpl_gen
         with get_session() as session:
             template_db = session.query(TemplateDB).filter_by(is_default=True).first()
             if template_db:
-                return TemplateService._db_to_model(template_db)
+                return _cache_template(
+                    TemplateService._db_to_model(template_db), generation
+                )
             return None
 
     @staticmethod
@@ -119,6 +144,13 @@ class TemplateService:
             templates_db = session.query(TemplateDB).all()
             return [TemplateService._db_to_model(t) for t in templates_db]
 
+    @staticmethod
+    def count_templates() -> int:
+        """テンプレートの件数を取得 (テンプレート本体は読み込まない)."""
+        with get_session() as session:
+            stmt = select(func.count()).select_from(TemplateDB)
+            return session.execute(stmt).scalar_one()
+
     @staticmethod
     def update_template(
         template_id: int,
@@ -160,39 +192,25 @@ class TemplateService:
                 template_db.description = description
 
             # デフォルトフラグの更新
-            if is_default is not None:
-                if is_default:
-                    # 既存のデフォルトを解除
-                    session.query(TemplateDB).filter_by(is_default=True).update(
-                        {"is_default": False}
-                    )
-                template_db.is_default = is_default
+            if is_default:
+                TemplateService._set_default(session, template_id)
+            elif is_default is not None:
+                template_db.is_default = False
 
             # フィールドの更新
             if fields is not None:
-                # 既存のフィールドを削除
-                session.query(TemplateFieldDB).filter_by(
-                    template_id=template_id
-                ).delete()
-
-                # 新しいフィールドを追加
-                for field in fields:
-                    field_db = TemplateFieldDB(
-                        template_id=template_id,
-                        name=field.name,
-                        label=field.label,
-                        field_type=field.field_type.value,
-                        required=field.required,
-                        default_value=field.default_value,
-                        placeholder=field.placeholder,
-                        max_length=field.max_length,
-                        order=field.order,
+                # 既存のフィールドを1文で削除し, 新しいフィールドをまとめて追加
+                session.execute(
+                    delete(TemplateFieldDB).where(
+                        TemplateFieldDB.template_id == template_id
                     )
-                    if field.options:
-                        field_db.options = field.options
-                    session.add(field_db)
+                )
+                TemplateService._insert_fields(session, template_id, fields)
+                # 読み込み済みのフィールドは古いため, 次の参照時に再読み込みさせる
+                session.expire(template_db, ["fields"])
 
             session.commit()
+            _invalidate_cache()
             return TemplateService._db_to_model(template_db)
 
     @staticmethod
@@ -219,6 +237,7 @@ class TemplateService:
 
             session.delete(template_db)
             session.commit()
+            _invalidate_cache()
             return True
 
     @staticmethod
@@ -240,22 +259,70 @@ class TemplateService:
             if not template_db:
                 raise ValueError(f"テンプレートID {template_id} が見つかりません")
 
-            # 既存のデフォルトを解除
-            session.query(TemplateDB).filter_by(is_default=True).update(
-                {"is_default": False}
-            )
-
-            # 新しいデフォルトを設定
-            template_db.is_default = True
+            TemplateService._set_default(session, template_id)
             session.commit()
+            _invalidate_cache()
 
             return TemplateService._db_to_model(template_db)
 
+    @staticmethod
+    def clear_cache() -> None:
+        """取得済みテンプレートのキャッシュを破棄.
+
+        サービスを経由せずにデータベースを変更した場合 (トランザクションの
+        ロールバックなど) に呼ぶ.
+        """
+        _invalidate_cache()
+
+    @staticmethod
+    def _set_default(session: Session, template_id: int) -> None:
+        """指定したテンプレートだけをデフォルトにする.
+
+        既存のデフォルト解除と新しいデフォルトの設定を
+        UPDATE templates SET is_default = (id = :id) の1文で行う.
+        対象は旧デフォルトと指定テンプレートの行だけに絞る.
+        セッション内のオブジェクトにも値が反映されるため, 追加の UPDATE は発生しない.
+        """
+        session.execute(
+            update(TemplateDB)
+            .where(or_(TemplateDB.is_default.is_(True), TemplateDB.id == template_id))
+            .values(is_default=TemplateDB.id == template_id)
+        )
+
+    @staticmethod
+    def _insert_fields(
+        session: Session, template_id: int, fields: list[TemplateField]
+    ) -> None:
+        """テンプレートのフィールドを1回の executemany で追加."""
+        if not fields:
+            return
+
+        rows = [
+            {
+                "template_id": template_id,
+                "name": field.name,
+                "label": field.label,
+                "field_type": field.field_type.value,
+                "required": field.required,
+                "default_value": field.default_value,
+                "options": field.options or None,
+                "placeholder": field.placeholder,
+                "max_length": field.max_length,
+                "order": field.order,
+            }
+            for field in fields
+        ]
+        # render_nulls: None の列を省略すると列の組み合わせごとに文が分かれるため
+        session.execute(
+            insert(TemplateFieldDB), rows, execution_options={"render_nulls": True}
+        )
+
     @staticmethod
     def _db_to_model(template_db: TemplateDB) -> Template:
         """データベースモデルをPydanticモデルに変換."""
         fields = []
-        for field_db in sorted(template_db.fields, key=lambda f: f.order):
+        # fields はリレーションの order_by により表示順で読み込まれている
+        for field_db in template_db.fields:
             field = TemplateField(
                 name=field_db.name,
                 label=field_db.label,
@@ -311,7 +378,7 @@ class TemplateService:
                 errors.append(f"フィールド{i+1}: 名前は必須です")
             if not field.label or not field.label.strip():
                 errors.append(f"フィールド{i+1}: ラベルは必須です")
-            if field.field_type == FieldType.SELECTION and not field.options:
+            if field.field_type is FieldType.SELECTION and not field.options:
                 errors.append(
                     f"フィールド{i+1} ({field.name}): 選択型には選択肢が必要です"
                 )
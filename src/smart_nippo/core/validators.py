@@ -1,10 +1,41 @@
 """Field validators for report input."""
 
 import re
-from datetime import date, datetime, timedelta
+from datetime import date, timedelta
 
 from .models import DateDefault, FieldType, TemplateField
 
+# 日付型のデフォルト値 → 今日からの日数
+_DATE_DEFAULT_DELTAS = {
+    DateDefault.TODAY.value: 0,
+    DateDefault.YESTERDAY.value: -1,
+    DateDefault.TOMORROW.value: 1,
+}
+
+# YYYY-MM-DD 形式 (月・日は1桁も可)
+_DATE_PATTERN = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+# HH:MM 形式 (時は1桁も可)
+_TIME_PATTERN = re.compile(r"^([0-1]?[0-9]|2[0-3]):([0-5][0-9])$")
+_MINUTES_PER_DAY = 24 * 60
+# 必須項目が未入力の場合のメッセージ
+_REQUIRED_MESSAGE = "'{label}' は必須項目です"
+
+
+def parse_date(value: str) -> date:
+    """YYYY-MM-DD 形式の文字列を date に変換 (不正な場合は ValueError).
+
+    date.fromisoformat は YYYYMMDD や週番号形式も受け付ける一方で 2024-1-5 は
+    受け付けないため, 区切りを正規表現で確認してから組み立てる.
+    """
+    match = _DATE_PATTERN.fullmatch(value)
+    if match:
+        year, month, day = map(int, match.groups())
+        try:
+            return date(year, month, day)
+        except ValueError:
+            pass
+    raise ValueError(f"無効な日付形式です: {value}")
+
 
 class FieldValidator:
     """フィールド値のバリデーター."""
@@ -13,23 +44,13 @@ class FieldValidator:
     def validate_date(value: str, field: TemplateField) -> str:  # noqa: ARG004
         """日付型の値を検証."""
         # デフォルト値の処理
-        if value in [
-            DateDefault.TODAY.value,
-            DateDefault.YESTERDAY.value,
-            DateDefault.TOMORROW.value,
-        ]:
-            today = date.today()
-            if value == DateDefault.TODAY.value:
-                return today.isoformat()
-            elif value == DateDefault.YESTERDAY.value:
-                return (today - timedelta(days=1)).isoformat()
-            elif value == DateDefault.TOMORROW.value:
-                return (today + timedelta(days=1)).isoformat()
+        delta = _DATE_DEFAULT_DELTAS.get(value)
+        if delta is not None:
+            return (date.today() + timedelta(days=delta)).isoformat()
 
         # YYYY-MM-DD形式のチェック
         try:
-            parsed_date = datetime.strptime(value, "%Y-%m-%d").date()
-            return parsed_date.isoformat()
+            return parse_date(value).isoformat()
         except ValueError as e:
             msg = f"日付は YYYY-MM-DD 形式で入力してください: {value}"
             raise ValueError(msg) from e
@@ -38,24 +59,13 @@ class FieldValidator:
     def validate_time(value: str, field: TemplateField) -> str:  # noqa: ARG004
         """時刻型の値を検証."""
         # HH:MM形式のチェック
-        time_pattern = re.compile(r"^([0-1]?[0-9]|2[0-3]):([0-5][0-9])$")
-        if not time_pattern.match(value):
+        match = _TIME_PATTERN.match(value)
+        if not match:
             raise ValueError(f"時刻は HH:MM 形式で入力してください: {value}")
 
-        # 15分刻みのチェック（オプション）
-        try:
-            hour, minute = map(int, value.split(":"))
-            if minute % 15 != 0:
-                # 最も近い15分刻みに丸める
-                rounded_minute = round(minute / 15) * 15
-                if rounded_minute == 60:
-                    hour = (hour + 1) % 24
-                    rounded_minute = 0
-                value = f"{hour:02d}:{rounded_minute:02d}"
-        except Exception as e:
-            raise ValueError(f"時刻の処理中にエラーが発生しました: {value}") from e
-
-        return value
+        # 最も近い15分刻みに丸める (23:53 以降は 00:00 に繰り上がる)
+        total = (int(match[1]) * 60 + int(match[2]) + 7) // 15 * 15 % _MINUTES_PER_DAY
+        return f"{total // 60:02d}:{total % 60:02d}"
 
     @staticmethod
     def validate_text(value: str, field: TemplateField) -> str:
@@ -100,28 +110,30 @@ class FieldValidator:
         """フィールドの値を検証."""
         # 必須チェック
         if field.required and not value:
-            raise ValueError(f"'{field.label}' は必須項目です")
+            raise ValueError(_REQUIRED_MESSAGE.format(label=field.label))
 
         # 値がない場合はデフォルト値を使用
         if not value:
             return field.default_value
 
         # 型別の検証
-        validators = {
-            FieldType.DATE: cls.validate_date,
-            FieldType.TIME: cls.validate_time,
-            FieldType.TEXT: cls.validate_text,
-            FieldType.MEMO: cls.validate_memo,
-            FieldType.SELECTION: cls.validate_selection,
-        }
-
-        validator = validators.get(field.field_type)
+        validator = _VALIDATORS.get(field.field_type)
         if not validator:
             raise ValueError(f"未対応のフィールドタイプ: {field.field_type}")
 
         return validator(value, field)
 
 
+# フィールドタイプごとの検証関数
+_VALIDATORS = {
+    FieldType.DATE: FieldValidator.validate_date,
+    FieldType.TIME: FieldValidator.validate_time,
+    FieldType.TEXT: FieldValidator.validate_text,
+    FieldType.MEMO: FieldValidator.validate_memo,
+    FieldType.SELECTION: FieldValidator.validate_selection,
+}
+
+
 def validate_report_data(
     data: dict[str, str | None], template_fields: list[TemplateField]
 ) -> dict[str, str | None]:
@@ -130,8 +142,17 @@ def validate_report_data(
     errors = []
 
     for field in template_fields:
+        value = data.get(field.name)
+        if not value:
+            # 未入力の項目は検証関数を呼ばず, 必須チェックとデフォルト値の適用のみ行う
+            if field.required:
+                message = _REQUIRED_MESSAGE.format(label=field.label)
+                errors.append(f"{field.label}: {message}")
+            elif field.default_value is not None:
+                validated_data[field.name] = field.default_value
+            continue
+
         try:
-            value = data.get(field.name)
             validated_value = FieldValidator.validate(value, field)
             if validated_value is not None:
                 validated_data[field.name] = validated_value
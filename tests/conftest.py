@@ -0,0 +1,223 @@
+"""Shared pytest fixtures."""
+
+import os
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+import typer
+from click.testing import Result
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.orm import Session, sessionmaker
+from typer.testing import CliRunner
+
+from smart_nippo.core.database import reset_database
+from smart_nippo.core.database.session import (
+    DATABASE_PATH_ENV,
+    MEMORY_DATABASE,
+    DatabaseManager,
+    get_database_manager,
+)
+from smart_nippo.core.models import Template
+from smart_nippo.core.services import TemplateService
+
+# テストではホームディレクトリのデータベースを使わず, インメモリ DB で実行する
+# (環境変数で実際の DB を指定していても, reset_database で消さないよう上書きする)
+os.environ[DATABASE_PATH_ENV] = MEMORY_DATABASE
+
+
+class QueryCounter:
+    """with ブロック内で実行された SQL 文を記録する.
+
+    テスト用トランザクションの SAVEPOINT 操作は数えない.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.statements: list[str] = []
+
+    def __enter__(self) -> "QueryCounter":
+        self.statements.clear()
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if not statement.startswith(("SAVEPOINT", "RELEASE")):
+            self.statements.append(statement)
+
+    def matching(self, prefix: str) -> list[str]:
+        """指定した文字列で始まる SQL 文を取得."""
+        return [s for s in self.statements if s.startswith(prefix)]
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """OS のクリップボードを使うテストを有効にするオプションを追加."""
+    parser.addoption(
+        "--real-clipboard",
+        action="store_true",
+        default=False,
+        help="real_clipboard マーカーの付いたテストを OS のクリップボードで実行する",
+    )
+
+
+@pytest.fixture(scope="session")
+def database() -> DatabaseManager:
+    """スキーマ作成とデフォルトテンプレートの登録をテストセッションで一度だけ行う."""
+    reset_database()
+    return get_database_manager()
+
+
+@pytest.fixture(scope="session")
+def seeded_db_image(database: DatabaseManager) -> bytes | None:
+    """デフォルトテンプレート登録直後のデータベースの内容 (セッションで一度だけ作成).
+
+    インメモリ DB 以外では None を返す. pytest-xdist のワーカーは別プロセスで
+    それぞれ専用のインメモリ DB を持つため, 内容もワーカーごとに作成される.
+    """
+    if not database.in_memory:
+        return None
+    reset_database()
+    with database.engine.connect() as connection:
+        return connection.connection.driver_connection.serialize()
+
+
+@pytest.fixture
+def fresh_db(
+    database: DatabaseManager, seeded_db_image: bytes | None
+) -> DatabaseManager:
+    """テストごとにデフォルトテンプレート登録直後の状態に戻す.
+
+    スキーマの作成と初期データの登録をやり直さず, 保存しておいた内容を
+    そのまま復元する. テーブル自体を変更するテストで使う.
+    """
+    if seeded_db_image is None:
+        reset_database()
+    else:
+        with database.engine.connect() as connection:
+            connection.connection.driver_connection.deserialize(seeded_db_image)
+        database.clear_table_cache()
+    TemplateService.clear_cache()
+    return database
+
+
+@pytest.fixture(scope="session")
+def baseline_default_template(database: DatabaseManager) -> Template:
+    """init_database で登録されるデフォルトテンプレート (セッションで一度だけ取得)."""
+    template = TemplateService.get_default_template()
+    assert template is not None
+    return template
+
+
+@pytest.fixture(scope="class")
+def db_connection(database: DatabaseManager) -> Generator[Connection, None, None]:
+    """テストクラスごとのトランザクションを開始し, クラス終了時にロールバック.
+
+    サービスのセッションはこの接続のトランザクションに参加し, commit() は
+    SAVEPOINT の解放になるため, テスト中の変更はデータベースに残らない.
+    クラス単位のフィクスチャで作成したデータはクラス内のテストで共有できる.
+    """
+    connection = database.engine.connect()
+    # pysqlite は BEGIN を自分で発行しないと SAVEPOINT の解放でコミットしてしまう
+    driver_connection = connection.connection.driver_connection
+    isolation_level = driver_connection.isolation_level
+    driver_connection.isolation_level = None
+    transaction = connection.begin()
+    connection.exec_driver_sql("BEGIN")
+
+    session_factory = database.SessionLocal
+    database.SessionLocal = sessionmaker(
+        bind=connection,
+        autoflush=False,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+    try:
+        yield connection
+    finally:
+        database.SessionLocal = session_factory
+        transaction.rollback()
+        driver_connection.isolation_level = isolation_level
+        connection.close()
+        TemplateService.clear_cache()
+
+
+@pytest.fixture
+def db_session(
+    database: DatabaseManager, db_connection: Connection
+) -> Generator[Session, None, None]:
+    """テストごとに SAVEPOINT を作成し, 終了時にそこまでロールバック."""
+    savepoint = db_connection.begin_nested()
+    try:
+        with database.SessionLocal() as session:
+            yield session
+    finally:
+        savepoint.rollback()
+        # ロールバックしたテンプレートがキャッシュに残らないようにする
+        TemplateService.clear_cache()
+
+
+@pytest.fixture
+def query_counter(database: DatabaseManager) -> QueryCounter:
+    """SQL 文の数を確認するためのカウンター (with ブロックで囲んで使う)."""
+    return QueryCounter(database.engine)
+
+
+class _RaisingCliRunner(CliRunner):
+    """想定外の例外を結果に閉じ込めず, そのまま送出する CliRunner."""
+
+    def invoke(self, *args: Any, **kwargs: Any) -> Result:
+        kwargs.setdefault("catch_exceptions", False)
+        return super().invoke(*args, **kwargs)
+
+
+@pytest.fixture(scope="session")
+def runner() -> CliRunner:
+    """CLI テスト用のランナー (テストセッションで共有).
+
+    typer.Exit などによる終了は従来どおり exit_code で確認できる.
+    """
+    return _RaisingCliRunner()
+
+
+@pytest.fixture(scope="session")
+def app() -> typer.Typer:
+    """CLI アプリケーション (CLI のテストを実行するときだけ読み込む)."""
+    from smart_nippo.cli.main import app as cli_app
+
+    return cli_app
+
+
+@pytest.fixture(autouse=True)
+def fake_clipboard(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> dict[str, str]:
+    """pyperclip の copy/paste を辞書への読み書きに置き換える.
+
+    OS のクリップボードは呼び出しごとに外部コマンドを起動するため遅く,
+    環境によっては使えない. real_clipboard マーカーの付いたテストだけは
+    --real-clipboard オプション指定時に OS のクリップボードで実行する.
+    クリップボードは CLI からしか使わないため, CLI を使わないテストでは
+    pyperclip を読み込まない.
+    """
+    buffer = {"data": ""}
+    if request.node.get_closest_marker("real_clipboard"):
+        if not request.config.getoption("--real-clipboard"):
+            pytest.skip("--real-clipboard を指定した場合のみ実行")
+        return buffer
+    if "app" not in request.fixturenames:
+        return buffer
+
+    import pyperclip
+
+    def copy(text: str) -> None:
+        buffer["data"] = text
+
+    monkeypatch.setattr(pyperclip, "copy", copy)
+    monkeypatch.setattr(pyperclip, "paste", lambda: buffer["data"])
+    return buffer
@@ -0,0 +1,86 @@
+"""Template fixtures shared by service tests."""
+
+import pytest
+
+from smart_nippo.core.models import FieldType, Template, TemplateField
+from smart_nippo.core.services import TemplateService
+
+_DATE_FIELD = TemplateField(
+    name="date",
+    label="Date",
+    field_type=FieldType.DATE,
+    required=True,
+    order=1,
+)
+
+
+@pytest.fixture(scope="class")
+def simple_date_template(db_connection) -> Template:
+    """日付フィールドだけのテンプレート (テストクラス内で共有)."""
+    return TemplateService.create_template(
+        name="Date Template",
+        description="Test template",
+        fields=[_DATE_FIELD],
+    )
+
+
+@pytest.fixture(scope="class")
+def memo_template(db_connection) -> Template:
+    """日付とメモ型の内容フィールドを持つテンプレート (テストクラス内で共有)."""
+    return TemplateService.create_template(
+        name="Memo Template",
+        description="Test template",
+        fields=[
+            _DATE_FIELD,
+            TemplateField(
+                name="content",
+                label="Content",
+                field_type=FieldType.MEMO,
+                required=True,
+                order=2,
+            ),
+        ],
+    )
+
+
+@pytest.fixture(scope="class")
+def project_template(db_connection) -> Template:
+    """日付とプロジェクトフィールドを持つテンプレート (テストクラス内で共有)."""
+    return TemplateService.create_template(
+        name="Project Template",
+        description="Test template",
+        fields=[
+            _DATE_FIELD,
+            TemplateField(
+                name="project",
+                label="Project",
+                field_type=FieldType.TEXT,
+                required=False,
+                order=2,
+            ),
+        ],
+    )
+
+
+@pytest.fixture
+def minimal_template(request, db_session) -> Template:
+    """フィールドが1つだけのテンプレート.
+
+    ``(field_type, field_name, label)`` を indirect パラメータで渡すと
+    そのフィールドで作成する (省略時はテキスト型).
+    """
+    field_type, field_name, label = getattr(
+        request, "param", (FieldType.TEXT, "test", "Test")
+    )
+    return TemplateService.create_template(
+        name="最小テンプレート",
+        fields=[
+            TemplateField(
+                name=field_name,
+                label=label,
+                field_type=field_type,
+                required=False,
+                order=1,
+            )
+        ],
+    )
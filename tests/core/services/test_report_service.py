@@ -1,49 +1,32 @@
 """Tests for report service functionality."""
 
-import pytest
+import re
 from datetime import date, datetime
+
+import pytest
 from unittest.mock import patch
 
-from smart_nippo.core.database import init_database, reset_database
+from sqlalchemy import text
+
+from smart_nippo.core.database.session import get_database_manager
 from smart_nippo.core.services.report_service import ReportService
 from smart_nippo.core.services.template_service import TemplateService
 from smart_nippo.core.models import Template, TemplateField, FieldType
 
+# pytest.raises の match に使う正規表現
+_DUP_DATE_RE = re.compile("の日報は既に存在します")
+_DUP_RE = re.compile("既に存在します")
+_BAD_DATE_RE = re.compile("無効な日付形式です")
+_TEMPLATE_NOT_FOUND_RE = re.compile("テンプレートID .* が見つかりません")
+_REPORT_NOT_FOUND_RE = re.compile("日報ID .* が見つかりません")
+
 
+@pytest.mark.usefixtures("db_session")
 class TestReportService:
     """Test cases for ReportService."""
 
-    @pytest.fixture(autouse=True)
-    def setup_database(self):
-        """テスト用データベースのセットアップ."""
-        reset_database()
-        init_database()
-        yield
-
-    def test_create_report(self):
+    def test_create_report(self, memo_template):
         """Test creating a new report."""
-        # Create a template first
-        template = TemplateService.create_template(
-            name="Test Template",
-            description="Test template",
-            fields=[
-                TemplateField(
-                    name="date",
-                    label="Date",
-                    field_type=FieldType.DATE,
-                    required=True,
-                    order=1
-                ),
-                TemplateField(
-                    name="content",
-                    label="Content", 
-                    field_type=FieldType.MEMO,
-                    required=True,
-                    order=2
-                )
-            ]
-        )
-        
         # Create a report
         test_data = {
             "date": "2025-08-06",
@@ -51,72 +34,102 @@ class TestReportService:
         }
         
         report = ReportService.create_report(
-            template_id=template.id,
+            template_id=memo_template.id,
             data=test_data,
             report_date=date(2025, 8, 6)
         )
         
         assert report is not None
         assert report.id is not None
-        assert report.template_id == template.id
-        assert report.template.name == "Test Template"
+        assert report.template_id == memo_template.id
+        assert report.template.name == memo_template.name
         assert report.get_date() == "2025-08-06"
         assert report.get_field_value("content") == "Test content"
         assert report.created_at is not None
 
-    def test_create_report_duplicate_date(self):
+    def test_create_report_duplicate_date(self, simple_date_template):
         """Test creating a report with duplicate date fails."""
-        # Create a template first
-        template = TemplateService.create_template(
-            name="Test Template",
-            description="Test template",
-            fields=[
-                TemplateField(
-                    name="date",
-                    label="Date",
-                    field_type=FieldType.DATE,
-                    required=True,
-                    order=1
-                )
-            ]
-        )
-        
         test_data = {"date": "2025-08-06"}
         
         # Create first report
         ReportService.create_report(
-            template_id=template.id,
+            template_id=simple_date_template.id,
             data=test_data,
             report_date=date(2025, 8, 6)
         )
         
         # Try to create another report for the same date
-        with pytest.raises(ValueError, match="の日報は既に存在します"):
+        with pytest.raises(ValueError, match=_DUP_DATE_RE):
             ReportService.create_report(
-                template_id=template.id,
+                template_id=simple_date_template.id,
                 data=test_data,
                 report_date=date(2025, 8, 6)
             )
 
-    def test_get_report_by_id(self):
-        """Test getting a report by ID."""
-        # Create a template and report
-        template = TemplateService.create_template(
-            name="Test Template",
-            description="Test template",
-            fields=[
-                TemplateField(
-                    name="date",
-                    label="Date",
-                    field_type=FieldType.DATE,
-                    required=True,
-                    order=1
-                )
-            ]
+    def test_create_report_single_insert(self, simple_date_template, query_counter):
+        """Test creating a report does not pre-check duplicates with a SELECT."""
+        with query_counter:
+            report = ReportService.create_report(
+                template_id=simple_date_template.id,
+                data={"date": "2025-08-06"}
+            )
+        statements = query_counter.statements
+
+        assert report.id is not None
+        assert report.created_at is not None
+        # template lookup (+ its fields) and INSERT ... ON CONFLICT DO NOTHING RETURNING
+        inserts = [s for s in statements if s.startswith("INSERT")]
+        assert len(inserts) == 1
+        assert "ON CONFLICT" in inserts[0]
+        assert not any(s.startswith("SELECT reports") for s in statements)
+
+    def test_create_reports_single_insert(self, simple_date_template, query_counter):
+        """Test bulk report creation issues one INSERT and keeps input order."""
+        with query_counter:
+            reports = ReportService.create_reports(
+                simple_date_template.id,
+                [{"date": "2025-08-07"}, {"content": "No date"}, {"date": "2025-08-06"}]
+            )
+        statements = query_counter.matching("INSERT")
+
+        assert len(statements) == 1
+        today = date.today().isoformat()
+        assert [r.get_date() for r in reports] == ["2025-08-07", today, "2025-08-06"]
+        assert all(r.id is not None for r in reports)
+
+    def test_create_reports_resolves_dates_like_create_report(self, memo_template):
+        """Test bulk and single creation store the same row for the same input."""
+        [bulk] = ReportService.create_reports(
+            memo_template.id, [{"date": "2024-1-5", "content": "Work"}]
         )
-        
+        single = ReportService.create_report(
+            memo_template.id, {"date": "2024-1-6", "content": "Work"}
+        )
+
+        assert bulk.data == {"content": "Work", "date": "2024-01-05"}
+        assert single.data == {"content": "Work", "date": "2024-01-06"}
+        with pytest.raises(ValueError, match=_BAD_DATE_RE):
+            ReportService.create_reports(memo_template.id, [{"date": "not-a-date"}])
+
+    def test_create_reports_duplicate_date(self, simple_date_template):
+        """Test bulk report creation fails as a whole on a duplicate date."""
+        ReportService.create_report(
+            template_id=simple_date_template.id,
+            data={"date": "2025-08-06"}
+        )
+
+        with pytest.raises(ValueError, match=_DUP_RE):
+            ReportService.create_reports(
+                simple_date_template.id,
+                [{"date": "2025-08-05"}, {"date": "2025-08-06"}]
+            )
+        assert ReportService.get_report(report_date=date(2025, 8, 5)) is None
+
+    def test_get_report_by_id(self, simple_date_template):
+        """Test getting a report by ID."""
+        # Create a report
         created_report = ReportService.create_report(
-            template_id=template.id,
+            template_id=simple_date_template.id,
             data={"date": "2025-08-06"}
         )
         
@@ -125,28 +138,14 @@ class TestReportService:
         
         assert retrieved_report is not None
         assert retrieved_report.id == created_report.id
-        assert retrieved_report.template_id == template.id
+        assert retrieved_report.template_id == simple_date_template.id
 
-    def test_get_report_by_date(self):
+    def test_get_report_by_date(self, simple_date_template):
         """Test getting a report by date."""
-        # Create a template and report
-        template = TemplateService.create_template(
-            name="Test Template",
-            description="Test template",
-            fields=[
-                TemplateField(
-                    name="date",
-                    label="Date",
-                    field_type=FieldType.DATE,
-                    required=True,
-                    order=1
-                )
-            ]
-        )
-        
+        # Create a report
         test_date = date(2025, 8, 6)
         ReportService.create_report(
-            template_id=template.id,
+            template_id=simple_date_template.id,
             data={"date": "2025-08-06"},
             report_date=test_date
         )
@@ -154,31 +153,101 @@ class TestReportService:
         # Get the report by date
         retrieved_report = ReportService.get_report(
             report_date=test_date,
-            template_id=template.id
+            template_id=simple_date_template.id
         )
         
         assert retrieved_report is not None
         assert retrieved_report.get_date() == "2025-08-06"
 
-    def test_update_report(self):
-        """Test updating a report."""
-        # Create a template and report
-        template = TemplateService.create_template(
-            name="Test Template",
-            description="Test template",
-            fields=[
-                TemplateField(
-                    name="content",
-                    label="Content",
-                    field_type=FieldType.MEMO,
-                    required=True,
-                    order=1
-                )
-            ]
+    def test_update_report_syncs_report_date(self, simple_date_template):
+        """Test updating the date in report data also moves the report date."""
+        report = ReportService.create_report(
+            template_id=simple_date_template.id,
+            data={"date": "2025-08-06"}
         )
-        
+
+        ReportService.update_report(report.id, data={"date": "2025-08-07"})
+
+        assert ReportService.get_report(report_date=date(2025, 8, 6)) is None
+        moved = ReportService.get_report(report_date=date(2025, 8, 7))
+        assert moved is not None
+        assert moved.id == report.id
+
+    def test_create_report_without_date_defaults_to_today(self, memo_template):
+        """Test a report without a date is filed under today."""
+        report = ReportService.create_report(
+            template_id=memo_template.id,
+            data={"content": "Work"}
+        )
+
+        assert report.get_date() == date.today().isoformat()
+        assert report.get_field_value("content") == "Work"
+
+    def test_create_report_accepts_one_digit_month_and_day(self, memo_template):
+        """Test dates accepted by the validators keep their day."""
+        report = ReportService.create_report(
+            template_id=memo_template.id,
+            data={"content": "Work", "date": "2024-1-5"}
+        )
+
+        assert report.get_date() == "2024-01-05"
+
+    def test_invalid_date_is_rejected(self, memo_template):
+        """Test an invalid date raises instead of being replaced or dropped."""
+        with pytest.raises(ValueError, match=_BAD_DATE_RE):
+            ReportService.create_report(
+                template_id=memo_template.id,
+                data={"content": "Work", "date": "not-a-date"}
+            )
+
+        report = ReportService.create_report(
+            template_id=memo_template.id,
+            data={"content": "Work", "date": "2024-01-05"}
+        )
+        with pytest.raises(ValueError, match=_BAD_DATE_RE):
+            ReportService.update_report(report.id, data={"date": "2024-13-01"})
+        assert ReportService.get_report(report_id=report.id).get_date() == "2024-01-05"
+
+    def test_update_report_duplicate_date(self, simple_date_template):
+        """Test moving a report onto an existing date raises ValueError."""
+        ReportService.create_report(
+            template_id=simple_date_template.id,
+            data={"date": "2025-08-06"}
+        )
+        report = ReportService.create_report(
+            template_id=simple_date_template.id,
+            data={"date": "2025-08-07"}
+        )
+
+        with pytest.raises(ValueError, match=_DUP_DATE_RE):
+            ReportService.update_report(report.id, data={"date": "2025-08-06"})
+
+        unchanged = ReportService.get_report(report_id=report.id)
+        assert unchanged.get_date() == "2025-08-07"
+
+    def test_date_stored_only_in_report_date(self, simple_date_template):
+        """Test the date lives in report_date and is restored into data."""
+        report = ReportService.create_report(
+            template_id=simple_date_template.id,
+            data={"date": "2025-08-06", "content": "Work"}
+        )
+
+        with get_database_manager().get_session() as session:
+            raw = session.execute(
+                text("SELECT data_json FROM reports WHERE id = :id"),
+                {"id": report.id},
+            ).scalar_one()
+
+        assert "date" not in raw
+        assert report.data == {"content": "Work", "date": "2025-08-06"}
+        fetched = ReportService.get_report(report_id=report.id)
+        assert fetched.get_date() == "2025-08-06"
+
+    def test_update_report(self, memo_template):
+        """Test updating a report."""
+        # Create a report
         created_report = ReportService.create_report(
-            template_id=template.id,
+            template_id=memo_template.id,
             data={"content": "Original content"}
         )
         
@@ -191,25 +260,11 @@ class TestReportService:
         assert updated_report.get_field_value("content") == "Updated content"
         assert updated_report.updated_at > created_report.created_at
 
-    def test_delete_report(self):
+    def test_delete_report(self, simple_date_template):
         """Test deleting a report."""
-        # Create a template and report
-        template = TemplateService.create_template(
-            name="Test Template",
-            description="Test template",
-            fields=[
-                TemplateField(
-                    name="date",
-                    label="Date",
-                    field_type=FieldType.DATE,
-                    required=True,
-                    order=1
-                )
-            ]
-        )
-        
+        # Create a report
         created_report = ReportService.create_report(
-            template_id=template.id,
+            template_id=simple_date_template.id,
             data={"date": "2025-08-06"}
         )
         
@@ -221,38 +276,15 @@ class TestReportService:
         deleted_report = ReportService.get_report(report_id=created_report.id)
         assert deleted_report is None
 
-    def test_list_reports(self):
+    def test_list_reports(self, project_template, query_counter):
         """Test listing reports."""
-        # Create a template
-        template = TemplateService.create_template(
-            name="Test Template",
-            description="Test template",
-            fields=[
-                TemplateField(
-                    name="date",
-                    label="Date",
-                    field_type=FieldType.DATE,
-                    required=True,
-                    order=1
-                ),
-                TemplateField(
-                    name="project",
-                    label="Project",
-                    field_type=FieldType.TEXT,
-                    required=False,
-                    order=2
-                )
-            ]
-        )
-        
         # Create multiple reports
-        ReportService.create_report(
-            template_id=template.id,
-            data={"date": "2025-08-06", "project": "Project A"}
-        )
-        ReportService.create_report(
-            template_id=template.id,
-            data={"date": "2025-08-07", "project": "Project B"}
+        ReportService.create_reports(
+            project_template.id,
+            [
+                {"date": "2025-08-06", "project": "Project A"},
+                {"date": "2025-08-07", "project": "Project B"},
+            ]
         )
         
         # List all reports
@@ -260,127 +292,191 @@ class TestReportService:
         assert len(reports) >= 2
         
         # List reports by date range
-        reports_in_range = ReportService.list_reports(
-            start_date=date(2025, 8, 6),
-            end_date=date(2025, 8, 6)
+        with query_counter:
+            reports_in_range = ReportService.list_reports(
+                start_date=date(2025, 8, 6),
+                end_date=date(2025, 8, 6)
+            )
+            assert len(reports_in_range) == 1
+            assert reports_in_range[0].get_date() == "2025-08-06"
+            assert reports_in_range[0].template.name == project_template.name
+        # reports + templates + template_fields
+        assert len(query_counter) == 3
+
+    def test_list_reports_created_order_breaks_ties_by_id(self, project_template):
+        """Test reports created within the same second keep insertion order."""
+        created = ReportService.create_reports(
+            project_template.id,
+            [{"date": f"2025-08-0{day}"} for day in range(1, 4)]
         )
-        assert len(reports_in_range) == 1
-        assert reports_in_range[0].get_date() == "2025-08-06"
+        ids = [report.id for report in created]
+
+        newest_first = ReportService.list_reports(order_by="created_desc")
+        oldest_first = ReportService.list_reports(order_by="created_asc")
+
+        assert [report.id for report in newest_first] == ids[::-1]
+        assert [report.id for report in oldest_first] == ids
+
+    def test_list_reports_query_count(self, query_counter):
+        """Test listing reports does not issue a query per report."""
+        for day in range(1, 6):
+            template = TemplateService.create_template(
+                name=f"Test Template {day}",
+                description="Test template",
+                fields=[
+                    TemplateField(
+                        name="date",
+                        label="Date",
+                        field_type=FieldType.DATE,
+                        required=True,
+                        order=1
+                    )
+                ]
+            )
+            ReportService.create_report(
+                template_id=template.id,
+                data={"date": f"2025-08-0{day}"}
+            )
+
+        with query_counter:
+            reports = ReportService.list_reports()
+        statements = query_counter.statements
+
+        assert len(reports) == 5
+        # reports + templates + template_fields
+        assert len(statements) == 3
+
+    def test_list_reports_shares_template(self, simple_date_template):
+        """Test reports of the same template share one converted template."""
+        for day in range(1, 4):
+            ReportService.create_report(
+                template_id=simple_date_template.id,
+                data={"date": f"2025-08-0{day}"}
+            )
+
+        with patch.object(
+            TemplateService, "_db_to_model", wraps=TemplateService._db_to_model
+        ) as convert:
+            reports = ReportService.list_reports(template_id=simple_date_template.id)
+
+        assert len(reports) == 3
+        assert convert.call_count == 1
+        assert reports[0].template is reports[1].template
+
+    def test_iter_reports_streams_in_batches(self, simple_date_template):
+        """Test iter_reports yields reports lazily across fetch batches."""
+        for day in range(1, 6):
+            ReportService.create_report(
+                template_id=simple_date_template.id,
+                data={"date": f"2025-08-0{day}"}
+            )
+
+        with patch("smart_nippo.core.services.report_service._YIELD_PER", 2):
+            reports = ReportService.iter_reports(order_by="date_asc")
+            assert not isinstance(reports, list)
+            dates = [r.get_date() for r in reports]
 
-    def test_search_reports(self):
+        assert dates == [f"2025-08-0{day}" for day in range(1, 6)]
+
+    def test_search_reports(self, memo_template, query_counter):
         """Test searching reports by keyword."""
-        # Create a template
-        template = TemplateService.create_template(
-            name="Test Template",
-            description="Test template",
-            fields=[
-                TemplateField(
-                    name="content",
-                    label="Content",
-                    field_type=FieldType.MEMO,
-                    required=True,
-                    order=1
-                )
-            ]
-        )
-        
         # Create reports with different content
-        ReportService.create_report(
-            template_id=template.id,
-            data={"content": "Python development work"}
-        )
-        ReportService.create_report(
-            template_id=template.id,
-            data={"content": "React frontend implementation"}
+        ReportService.create_reports(
+            memo_template.id,
+            [
+                {"date": "2025-08-06", "content": "Python development work"},
+                {"date": "2025-08-07", "content": "React frontend implementation"},
+            ]
         )
         
         # Search for specific keyword
-        python_reports = ReportService.search_reports("Python")
-        assert len(python_reports) >= 1
-        assert "Python" in python_reports[0].get_field_value("content")
+        with query_counter:
+            python_reports = ReportService.search_reports("Python")
+            assert len(python_reports) >= 1
+            assert "Python" in python_reports[0].get_field_value("content")
+            assert python_reports[0].template.name == memo_template.name
+        assert len(query_counter) == 3
 
-    def test_get_monthly_reports(self):
+    def test_get_monthly_reports(self, simple_date_template, query_counter):
         """Test getting monthly reports."""
-        # Create a template
-        template = TemplateService.create_template(
-            name="Test Template",
-            description="Test template",
-            fields=[
-                TemplateField(
-                    name="date",
-                    label="Date",
-                    field_type=FieldType.DATE,
-                    required=True,
-                    order=1
-                )
+        # Create reports for August 2025 and one for a different month
+        ReportService.create_reports(
+            simple_date_template.id,
+            [
+                {"date": "2025-08-01"},
+                {"date": "2025-08-15"},
+                {"date": "2025-07-30"},
             ]
         )
         
-        # Create reports for August 2025
-        ReportService.create_report(
-            template_id=template.id,
-            data={"date": "2025-08-01"}
-        )
-        ReportService.create_report(
-            template_id=template.id,
-            data={"date": "2025-08-15"}
-        )
-        # Create a report for different month
-        ReportService.create_report(
-            template_id=template.id,
-            data={"date": "2025-07-30"}
-        )
-        
         # Get monthly reports
-        august_reports = ReportService.get_monthly_reports(2025, 8)
-        august_dates = [report.get_date() for report in august_reports]
+        with query_counter:
+            august_reports = ReportService.get_monthly_reports(2025, 8)
+            august_dates = [report.get_date() for report in august_reports]
+            assert all(r.template.fields for r in august_reports)
+        assert len(query_counter) == 3
         
         assert "2025-08-01" in august_dates
         assert "2025-08-15" in august_dates
         assert "2025-07-30" not in august_dates
 
-    def test_get_statistics(self):
+    def test_get_statistics(self, project_template, query_counter):
         """Test getting report statistics."""
-        # Create a template
-        template = TemplateService.create_template(
-            name="Test Template",
-            description="Test template",
-            fields=[
-                TemplateField(
-                    name="project",
-                    label="Project",
-                    field_type=FieldType.TEXT,
-                    required=False,
-                    order=1
-                )
+        # Create multiple reports
+        ReportService.create_reports(
+            project_template.id,
+            [
+                {"date": "2025-08-06", "project": "Project A"},
+                {"date": "2025-08-07", "project": "Project A"},
+                {"date": "2025-08-08", "project": "Project B"},
             ]
         )
         
-        # Create multiple reports
+        # Get statistics (aggregated in SQL: one GROUP BY per breakdown)
+        with query_counter:
+            stats = ReportService.get_statistics()
+        assert len(query_counter) <= 2
+        assert all("GROUP BY" in s for s in query_counter.statements)
+        
+        assert stats["total_reports"] >= 3
+        assert project_template.name in stats["templates_used"]
+        assert stats["projects"]["Project A"] >= 2
+        assert stats["projects"]["Project B"] >= 1
+
+    def test_get_statistics_aggregates_in_sql(self, project_template, query_counter):
+        """Test statistics are computed with aggregate queries only."""
         ReportService.create_report(
-            template_id=template.id,
-            data={"project": "Project A"}
+            template_id=project_template.id,
+            data={"date": "2025-08-01", "project": "Project A"}
         )
         ReportService.create_report(
-            template_id=template.id,
-            data={"project": "Project A"}
+            template_id=project_template.id,
+            data={"date": "2025-08-02", "project": ""}
         )
         ReportService.create_report(
-            template_id=template.id,
-            data={"project": "Project B"}
+            template_id=project_template.id,
+            data={"date": "2025-08-03"}
         )
-        
-        # Get statistics
-        stats = ReportService.get_statistics()
-        
-        assert stats["total_reports"] >= 3
-        assert "Test Template" in stats["templates_used"]
-        assert stats["projects"]["Project A"] >= 2
-        assert stats["projects"]["Project B"] >= 1
+        ReportService.create_report(
+            template_id=project_template.id,
+            data={"date": "2025-09-01", "project": "Project A"}
+        )
+
+        with query_counter:
+            stats = ReportService.get_statistics(
+                start_date=date(2025, 8, 1),
+                end_date=date(2025, 8, 31)
+            )
+        statements = query_counter.statements
+
+        assert stats["total_reports"] == 3
+        assert stats["templates_used"] == {project_template.name: 3}
+        assert stats["projects"] == {"Project A": 1, "未分類": 2}
+        assert len(statements) == 2
 
     def test_invalid_template_id(self):
         """Test creating a report with invalid template ID."""
-        with pytest.raises(ValueError, match="テンプレートID .* が見つかりません"):
+        with pytest.raises(ValueError, match=_TEMPLATE_NOT_FOUND_RE):
             ReportService.create_report(
                 template_id=999,
                 data={"date": "2025-08-06"}
@@ -388,7 +484,7 @@ class TestReportService:
 
     def test_update_nonexistent_report(self):
         """Test updating a nonexistent report."""
-        with pytest.raises(ValueError, match="日報ID .* が見つかりません"):
+        with pytest.raises(ValueError, match=_REPORT_NOT_FOUND_RE):
             ReportService.update_report(
                 report_id=999,
                 data={"content": "New content"}
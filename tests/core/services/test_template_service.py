@@ -1,22 +1,31 @@
 """Tests for template service."""
 
+import re
+
 import pytest
 
-from smart_nippo.core.database import init_database, reset_database
+from smart_nippo.core.database import reset_database
 from smart_nippo.core.models import FieldType, Template, TemplateField
 from smart_nippo.core.services import TemplateService
 
+# pytest.raises の match に使う正規表現
+_DUP_NAME_RE = re.compile("既に存在します")
+_DELETE_DEFAULT_RE = re.compile("デフォルトテンプレートは削除できません")
+
+# 1フィールドだけのテンプレート用の共通フィールド (model_copy で複製して使う)
+_TEXT_FIELD = TemplateField(
+    name="test",
+    label="Test",
+    field_type=FieldType.TEXT,
+    required=False,
+    order=1,
+)
 
+
+@pytest.mark.usefixtures("db_session")
 class TestTemplateService:
     """Template service tests."""
 
-    @pytest.fixture(autouse=True)
-    def setup_database(self):
-        """テスト用データベースのセットアップ."""
-        reset_database()
-        init_database()
-        yield
-
     def test_create_template(self) -> None:
         """テンプレート作成テスト."""
         # テストデータ準備
@@ -66,64 +75,34 @@ class TestTemplateService:
 
     def test_create_template_duplicate_name(self) -> None:
         """重複名でのテンプレート作成エラーテスト."""
-        fields = [
-            TemplateField(
-                name="test",
-                label="Test",
-                field_type=FieldType.TEXT,
-                required=False,
-                order=1,
-            )
-        ]
+        fields = [_TEXT_FIELD.model_copy()]
 
         # 最初のテンプレート作成
         TemplateService.create_template(name="重複テスト", fields=fields)
 
         # 同じ名前で再作成（エラーになるはず）
-        with pytest.raises(ValueError, match="既に存在します"):
+        with pytest.raises(ValueError, match=_DUP_NAME_RE):
             TemplateService.create_template(name="重複テスト", fields=fields)
 
-    def test_get_template_by_id(self) -> None:
-        """ID指定でのテンプレート取得テスト."""
-        # テストデータ作成
-        fields = [
-            TemplateField(
-                name="memo",
-                label="メモ",
-                field_type=FieldType.MEMO,
-                required=False,
-                order=1,
-            )
-        ]
-        created = TemplateService.create_template(name="ID取得テスト", fields=fields)
-
-        # ID指定で取得
-        template = TemplateService.get_template(template_id=created.id)
+    @pytest.mark.parametrize(
+        ("minimal_template", "lookup_kind"),
+        [
+            ((FieldType.MEMO, "memo", "メモ"), "id"),
+            ((FieldType.TIME, "time", "時刻"), "name"),
+        ],
+        indirect=["minimal_template"],
+    )
+    def test_get_template(self, minimal_template, lookup_kind) -> None:
+        """ID指定・名前指定でのテンプレート取得テスト."""
+        if lookup_kind == "id":
+            template = TemplateService.get_template(template_id=minimal_template.id)
+        else:
+            template = TemplateService.get_template(name=minimal_template.name)
 
         assert template is not None
-        assert template.id == created.id
-        assert template.name == "ID取得テスト"
-
-    def test_get_template_by_name(self) -> None:
-        """名前指定でのテンプレート取得テスト."""
-        # テストデータ作成
-        fields = [
-            TemplateField(
-                name="time",
-                label="時刻",
-                field_type=FieldType.TIME,
-                required=True,
-                order=1,
-            )
-        ]
-        created = TemplateService.create_template(name="名前取得テスト", fields=fields)
-
-        # 名前指定で取得
-        template = TemplateService.get_template(name="名前取得テスト")
-
-        assert template is not None
-        assert template.id == created.id
-        assert template.name == "名前取得テスト"
+        assert template.id == minimal_template.id
+        assert template.name == minimal_template.name
+        assert template.fields == minimal_template.fields
 
     def test_get_template_not_found(self) -> None:
         """存在しないテンプレートの取得テスト."""
@@ -135,21 +114,12 @@ class TestTemplateService:
         template = TemplateService.get_template(name="存在しない")
         assert template is None
 
-    def test_get_default_template(self) -> None:
+    def test_get_default_template(self, baseline_default_template) -> None:
         """デフォルトテンプレート取得テスト."""
-        fields = [
-            TemplateField(
-                name="test",
-                label="Test",
-                field_type=FieldType.TEXT,
-                required=False,
-                order=1,
-            )
-        ]
+        fields = [_TEXT_FIELD.model_copy()]
 
         # init_databaseで既にデフォルトテンプレートが作成されている
-        existing_default = TemplateService.get_default_template()
-        assert existing_default is not None
+        assert baseline_default_template.is_default is True
 
         # デフォルトテンプレート作成
         created = TemplateService.create_template(
@@ -162,24 +132,113 @@ class TestTemplateService:
         default = TemplateService.get_default_template()
         assert default is not None
         assert default.id == created.id
+        assert default.id != baseline_default_template.id
         assert default.is_default is True
 
-    def test_list_templates(self) -> None:
-        """テンプレート一覧取得テスト."""
-        # 初期状態（init_databaseで標準テンプレートが1つ作成される）
-        initial_templates = TemplateService.list_templates()
-        initial_count = len(initial_templates)
+    def test_fields_inserted_in_one_statement(self, query_counter) -> None:
+        """作成・更新時にフィールドが1文でまとめて挿入されることを確認."""
+        fields = [
+            TemplateField(
+                name=f"field{i}",
+                label=f"Field {i}",
+                field_type=FieldType.TEXT,
+                required=False,
+                order=i,
+            )
+            for i in range(1, 4)
+        ]
 
-        # テンプレート複数作成
+        with query_counter:
+            template = TemplateService.create_template(name="一括", fields=fields)
+            updated = TemplateService.update_template(
+                template.id, fields=list(reversed(fields[:2]))
+            )
+        statements = query_counter.matching("INSERT INTO template_fields")
+
+        assert len(statements) == 2
+        assert [f.name for f in template.fields] == ["field1", "field2", "field3"]
+        assert [f.name for f in updated.fields] == ["field1", "field2"]
+
+    def test_fields_returned_in_order(self) -> None:
+        """フィールドが表示順で返されることを確認."""
         fields = [
             TemplateField(
-                name="test",
-                label="Test",
+                name=name,
+                label=name,
                 field_type=FieldType.TEXT,
                 required=False,
-                order=1,
+                order=order,
             )
+            for name, order in [("b", 2), ("c", 3), ("a", 1)]
         ]
+        created = TemplateService.create_template(name="順序", fields=fields)
+
+        template = TemplateService.get_template(template_id=created.id)
+        assert [f.name for f in created.fields] == ["a", "b", "c"]
+        assert [f.name for f in template.fields] == ["a", "b", "c"]
+
+    def test_list_templates_query_count(self, query_counter) -> None:
+        """テンプレート一覧取得でフィールドをまとめて読み込むことを確認."""
+        fields = [_TEXT_FIELD.model_copy()]
+        for i in range(5):
+            TemplateService.create_template(name=f"件数テスト{i}", fields=fields)
+
+        with query_counter:
+            templates = TemplateService.list_templates()
+        statements = query_counter.statements
+
+        assert len(templates) == 6
+        assert all(t.fields for t in templates)
+        # templates + template_fields
+        assert len(statements) == 2
+
+    def test_get_template_cached(self, minimal_template, query_counter) -> None:
+        """取得済みのテンプレートは再取得時にクエリを発行しないことを確認."""
+        TemplateService.get_template(template_id=minimal_template.id)
+        TemplateService.get_default_template()
+
+        with query_counter:
+            template = TemplateService.get_template(template_id=minimal_template.id)
+            default = TemplateService.get_default_template()
+        statements = query_counter.statements
+
+        assert template.name == minimal_template.name
+        assert default is not None and default.is_default is True
+        assert statements == []
+
+    def test_cached_template_is_not_shared(self, minimal_template) -> None:
+        """取得したテンプレートを変更してもキャッシュに影響しないことを確認."""
+        first = TemplateService.get_template(template_id=minimal_template.id)
+        first.name = "変更"
+        first.fields.pop()
+        default = TemplateService.get_default_template()
+        default.name = "変更"
+
+        again = TemplateService.get_template(template_id=minimal_template.id)
+        assert again.name == minimal_template.name
+        assert len(again.fields) == len(minimal_template.fields)
+        assert TemplateService.get_default_template().name != "変更"
+
+    def test_template_cache_invalidated_on_write(self, minimal_template) -> None:
+        """更新・デフォルト変更でキャッシュが破棄されることを確認."""
+        created = minimal_template
+        assert TemplateService.get_template(template_id=created.id).name == created.name
+
+        TemplateService.update_template(created.id, name="更新後")
+        assert TemplateService.get_template(template_id=created.id).name == "更新後"
+
+        TemplateService.set_default_template(created.id)
+        assert TemplateService.get_template(template_id=created.id).is_default
+        assert TemplateService.get_default_template().id == created.id
+
+    def test_list_templates(self, baseline_default_template) -> None:
+        """テンプレート一覧取得テスト."""
+        # 初期状態（init_databaseで標準テンプレートが1つ作成される）
+        initial_count = TemplateService.count_templates()
+        assert initial_count == 1
+
+        # テンプレート複数作成
+        fields = [_TEXT_FIELD.model_copy()]
 
         TemplateService.create_template(name="テンプレート1", fields=fields)
         TemplateService.create_template(name="テンプレート2", fields=fields)
@@ -190,10 +249,11 @@ class TestTemplateService:
         )
 
         # 一覧取得
+        assert TemplateService.count_templates() == initial_count + 3
         templates = TemplateService.list_templates()
-        assert len(templates) == initial_count + 3
 
         names = [t.name for t in templates]
+        assert baseline_default_template.name in names
         assert "テンプレート1" in names
         assert "テンプレート2" in names
         assert "テンプレート3" in names
@@ -262,63 +322,31 @@ class TestTemplateService:
         assert "selection" in field_names
         assert "original" not in field_names  # 古いフィールドは削除されている
 
-    def test_delete_template(self) -> None:
+    def test_delete_template(self, minimal_template) -> None:
         """テンプレート削除テスト."""
-        fields = [
-            TemplateField(
-                name="delete_test",
-                label="Delete Test",
-                field_type=FieldType.TEXT,
-                required=False,
-                order=1,
-            )
-        ]
-        created = TemplateService.create_template(name="削除テスト", fields=fields)
-
         # 削除実行
-        result = TemplateService.delete_template(created.id)
+        result = TemplateService.delete_template(minimal_template.id)
         assert result is True
 
         # 削除確認
-        template = TemplateService.get_template(template_id=created.id)
+        template = TemplateService.get_template(template_id=minimal_template.id)
         assert template is None
 
         # 存在しないIDの削除
         result = TemplateService.delete_template(999)
         assert result is False
 
-    def test_delete_default_template_error(self) -> None:
+    def test_delete_default_template_error(self, minimal_template) -> None:
         """デフォルトテンプレート削除エラーテスト."""
-        fields = [
-            TemplateField(
-                name="test",
-                label="Test",
-                field_type=FieldType.TEXT,
-                required=False,
-                order=1,
-            )
-        ]
-        created = TemplateService.create_template(
-            name="デフォルト削除テスト",
-            fields=fields,
-            is_default=True,
-        )
+        TemplateService.set_default_template(minimal_template.id)
 
         # デフォルトテンプレートの削除はエラー
-        with pytest.raises(ValueError, match="デフォルトテンプレートは削除できません"):
-            TemplateService.delete_template(created.id)
+        with pytest.raises(ValueError, match=_DELETE_DEFAULT_RE):
+            TemplateService.delete_template(minimal_template.id)
 
     def test_set_default_template(self) -> None:
         """デフォルトテンプレート設定テスト."""
-        fields = [
-            TemplateField(
-                name="test",
-                label="Test",
-                field_type=FieldType.TEXT,
-                required=False,
-                order=1,
-            )
-        ]
+        fields = [_TEXT_FIELD.model_copy()]
 
         # テンプレート2つ作成
         template1 = TemplateService.create_template(
@@ -343,22 +371,35 @@ class TestTemplateService:
         assert template1_reloaded.is_default is False  # 解除されている
         assert template2_reloaded.is_default is True
 
+    def test_set_default_template_single_update(
+        self, minimal_template, query_counter
+    ) -> None:
+        """デフォルト設定が1回の UPDATE で行われることを確認."""
+        with query_counter:
+            updated = TemplateService.set_default_template(minimal_template.id)
+        statements = query_counter.matching("UPDATE")
+
+        assert updated.is_default is True
+        assert len(statements) == 1
+        defaults = [t for t in TemplateService.list_templates() if t.is_default]
+        assert [t.id for t in defaults] == [minimal_template.id]
+
     def test_validate_template_data(self) -> None:
         """テンプレートデータ検証テスト."""
-        # 正常なテンプレート
-        valid_template = Template(
+        # 正常なテンプレート (検証対象はサービス層なので Pydantic の検証は省略)
+        valid_template = Template.model_construct(
             id=1,
             name="有効なテンプレート",
             description="説明",
             fields=[
-                TemplateField(
+                TemplateField.model_construct(
                     name="field1",
                     label="フィールド1",
                     field_type=FieldType.TEXT,
                     required=True,
                     order=1,
                 ),
-                TemplateField(
+                TemplateField.model_construct(
                     name="field2",
                     label="フィールド2",
                     field_type=FieldType.SELECTION,
@@ -392,7 +433,7 @@ class TestTemplateService:
         assert "テンプレート名は必須です" in errors
 
         # フィールドなし
-        no_fields_template = Template(
+        no_fields_template = Template.model_construct(
             id=1,
             name="フィールドなし",
             description="説明",
@@ -407,3 +448,17 @@ class TestTemplateService:
 
         # 選択型で選択肢なしの検証は、Pydanticレベルで自動的に行われるため
         # サービス層のvalidate_template_dataではその他の検証ロジックをテスト
+
+
+class TestTemplateCacheReset:
+    """Template cache tests that rebuild the schema."""
+
+    def test_template_cache_invalidated_on_reset(self) -> None:
+        """データベース初期化でキャッシュが破棄されることを確認."""
+        reset_database()
+        fields = [_TEXT_FIELD.model_copy()]
+        created = TemplateService.create_template(name="初期化前", fields=fields)
+        assert TemplateService.get_template(template_id=created.id) is not None
+
+        reset_database()
+        assert TemplateService.get_template(template_id=created.id) is None
@@ -1,9 +1,10 @@
 """Tests for configuration management."""
 
-import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
+import yaml
 
 from smart_nippo.core.config import (
     Config,
@@ -15,33 +16,47 @@ from smart_nippo.core.config import (
 )
 
 
+@pytest.fixture(scope="session")
+def readonly_config_manager(tmp_path_factory: pytest.TempPathFactory) -> ConfigManager:
+    """値を変更しないテストで共有する ConfigManager (デフォルト設定)."""
+    return ConfigManager(tmp_path_factory.mktemp("cfg") / "config.yaml")
+
+
+@pytest.fixture
+def fresh_config_manager(tmp_path: Path) -> ConfigManager:
+    """テストごとに新しい設定ファイルを使う ConfigManager."""
+    return ConfigManager(tmp_path / "config.yaml")
+
+
 class TestConfigModels:
     """設定モデルのテスト."""
 
-    def test_database_config_defaults(self):
-        """DatabaseConfigのデフォルト値をテスト."""
-        config = DatabaseConfig()
-        assert config.path == "~/.smart-nippo/data.db"
-
-    def test_editor_config_defaults(self):
-        """EditorConfigのデフォルト値をテスト."""
-        config = EditorConfig()
-        assert config.command == "vim"
-
-    def test_display_config_defaults(self):
-        """DisplayConfigのデフォルト値をテスト."""
-        config = DisplayConfig()
-        assert config.date_format == "%Y-%m-%d"
-        assert config.time_format == "%H:%M"
-        assert config.language == "ja"
-        assert config.timezone == "Asia/Tokyo"
-
-    def test_defaults_config_defaults(self):
-        """DefaultsConfigのデフォルト値をテスト."""
-        config = DefaultsConfig()
-        assert config.project == ""
-        assert config.template == "default"
-        assert config.export_format == "markdown"
+    @pytest.mark.parametrize(
+        "cls,expected",
+        [
+            (DatabaseConfig, {"path": "~/.smart-nippo/data.db"}),
+            (EditorConfig, {"command": "vim"}),
+            (
+                DisplayConfig,
+                {
+                    "date_format": "%Y-%m-%d",
+                    "time_format": "%H:%M",
+                    "language": "ja",
+                    "timezone": "Asia/Tokyo",
+                },
+            ),
+            (
+                DefaultsConfig,
+                {"project": "", "template": "default", "export_format": "markdown"},
+            ),
+        ],
+        ids=["database", "editor", "display", "defaults"],
+    )
+    def test_defaults(self, cls, expected):
+        """各設定モデルのデフォルト値をテスト."""
+        config = cls()
+        for key, value in expected.items():
+            assert getattr(config, key) == value
 
     def test_config_creation(self):
         """設定の作成をテスト."""
@@ -61,163 +76,175 @@ class TestConfigManager:
         assert manager.config_path.name == "config.yaml"
         assert ".smart-nippo" in str(manager.config_path)
 
-    def test_custom_config_path(self):
+    def test_custom_config_path(self, tmp_path):
         """カスタムの設定ファイルパスが正しく設定されることを確認."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            custom_path = Path(temp_dir) / "custom_config.yaml"
-            manager = ConfigManager(custom_path)
-            assert manager.config_path == custom_path
+        custom_path = tmp_path / "custom_config.yaml"
+        manager = ConfigManager(custom_path)
+        assert manager.config_path == custom_path
 
-    def test_load_creates_default_config(self):
+    def test_load_creates_default_config(self, fresh_config_manager):
         """設定ファイルが存在しない場合にデフォルト設定が作成されることをテスト."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "config.yaml"
-            manager = ConfigManager(config_path)
+        manager = fresh_config_manager
+        config_path = manager.config_path
 
-            config = manager.load()
+        config = manager.load()
 
-            # デフォルト設定が読み込まれることを確認
-            assert isinstance(config, Config)
-            assert config.database.path == "~/.smart-nippo/data.db"
-            assert config.editor.command == "vim"
+        # デフォルト設定が読み込まれることを確認
+        assert isinstance(config, Config)
+        assert config.database.path == "~/.smart-nippo/data.db"
+        assert config.editor.command == "vim"
 
-            # ファイルが作成されることを確認
-            assert config_path.exists()
+        # ファイルが作成されることを確認
+        assert config_path.exists()
 
-    def test_save_and_load_config(self):
+    def test_save_and_load_config(self, fresh_config_manager):
         """設定の保存と読み込みをテスト."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "config.yaml"
-            manager = ConfigManager(config_path)
-
-            # カスタム設定を作成
-            config = Config()
-            config.database.path = "/custom/path/data.db"
-            config.editor.command = "nano"
-            config.defaults.project = "デフォルトプロジェクト"
-
-            # 保存
-            manager.save(config)
-            assert config_path.exists()
-
-            # 新しいマネージャーで読み込み
-            manager2 = ConfigManager(config_path)
-            loaded_config = manager2.load()
-
-            # 値が正しく保存・読み込みされることを確認
-            assert loaded_config.database.path == "/custom/path/data.db"
-            assert loaded_config.editor.command == "nano"
-            assert loaded_config.defaults.project == "デフォルトプロジェクト"
-
-    def test_get_method(self):
+        manager = fresh_config_manager
+        config_path = manager.config_path
+
+        # カスタム設定を作成
+        config = Config()
+        config.database.path = "/custom/path/data.db"
+        config.editor.command = "nano"
+        config.defaults.project = "デフォルトプロジェクト"
+
+        # 保存
+        manager.save(config)
+        assert config_path.exists()
+
+        # 新しいマネージャーで読み込み
+        manager2 = ConfigManager(config_path)
+        loaded_config = manager2.load()
+
+        # 値が正しく保存・読み込みされることを確認
+        assert loaded_config.database.path == "/custom/path/data.db"
+        assert loaded_config.editor.command == "nano"
+        assert loaded_config.defaults.project == "デフォルトプロジェクト"
+
+    def test_get_method(self, readonly_config_manager):
         """get メソッドのテスト."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "config.yaml"
-            manager = ConfigManager(config_path)
+        manager = readonly_config_manager
+
+        # 値を取得
+        assert manager.get("database.path") == "~/.smart-nippo/data.db"
+        assert manager.get("editor.command") == "vim"
+        assert manager.get("display.language") == "ja"
 
-            # 値を取得
-            assert manager.get("database.path") == "~/.smart-nippo/data.db"
-            assert manager.get("editor.command") == "vim"
-            assert manager.get("display.language") == "ja"
+        # 存在しないキーのデフォルト値
+        assert manager.get("nonexistent.key", "default") == "default"
 
-            # 存在しないキーのデフォルト値
-            assert manager.get("nonexistent.key", "default") == "default"
+    def test_get_section_and_nested_missing_key(self, readonly_config_manager):
+        """セクション単位の取得と存在しない下位キーのテスト."""
+        manager = readonly_config_manager
 
-    def test_set_method(self):
+        assert manager.get("editor") == EditorConfig()
+        assert manager.get("editor.command.extra", "default") == "default"
+
+    def test_set_method(self, fresh_config_manager):
         """set メソッドのテスト."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "config.yaml"
-            manager = ConfigManager(config_path)
+        manager = fresh_config_manager
+        config_path = manager.config_path
 
-            # 値を設定
-            manager.set("database.path", "/new/path/data.db")
-            manager.set("editor.command", "code")
+        # 値を設定
+        manager.set("database.path", "/new/path/data.db")
+        manager.set("editor.command", "code")
 
-            # 値が正しく設定されることを確認
-            assert manager.get("database.path") == "/new/path/data.db"
-            assert manager.get("editor.command") == "code"
+        # 値が正しく設定されることを確認
+        assert manager.get("database.path") == "/new/path/data.db"
+        assert manager.get("editor.command") == "code"
 
-            # ファイルに保存されることを確認
-            manager2 = ConfigManager(config_path)
-            assert manager2.get("database.path") == "/new/path/data.db"
-            assert manager2.get("editor.command") == "code"
+        # ファイルに保存されることを確認
+        manager2 = ConfigManager(config_path)
+        assert manager2.get("database.path") == "/new/path/data.db"
+        assert manager2.get("editor.command") == "code"
 
-    def test_set_invalid_key(self):
+    def test_set_invalid_key(self, readonly_config_manager):
         """無効なキーの設定でエラーが発生することをテスト."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "config.yaml"
-            manager = ConfigManager(config_path)
-
-            with pytest.raises(ValueError, match="設定キー.*が見つかりません"):
-                manager.set("invalid.key", "value")
+        with pytest.raises(ValueError, match="設定キー.*が見つかりません"):
+            readonly_config_manager.set("invalid.key", "value")
 
-    def test_reload_method(self):
+    def test_reload_method(self, fresh_config_manager):
         """reload メソッドのテスト."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "config.yaml"
-            manager = ConfigManager(config_path)
-
-            # 初回読み込み
-            config1 = manager.load()
-            original_path = config1.database.path
-
-            # 外部でファイルを変更（実際の使用ケースをシミュレート）
-            import yaml
-            with open(config_path, "w", encoding="utf-8") as f:
-                data = {
-                    "database": {"path": "/external/change/data.db"},
-                    "editor": {"command": "vim"},
-                    "display": {
-                        "date_format": "%Y-%m-%d",
-                        "time_format": "%H:%M",
-                        "language": "ja",
-                        "timezone": "Asia/Tokyo"
-                    },
-                    "defaults": {
-                        "project": "",
-                        "template": "default",
-                        "export_format": "markdown"
-                    }
+        manager = fresh_config_manager
+        config_path = manager.config_path
+
+        # 初回読み込み
+        config1 = manager.load()
+        original_path = config1.database.path
+
+        # 外部でファイルを変更（実際の使用ケースをシミュレート）
+        with open(config_path, "w", encoding="utf-8") as f:
+            data = {
+                "database": {"path": "/external/change/data.db"},
+                "editor": {"command": "vim"},
+                "display": {
+                    "date_format": "%Y-%m-%d",
+                    "time_format": "%H:%M",
+                    "language": "ja",
+                    "timezone": "Asia/Tokyo"
+                },
+                "defaults": {
+                    "project": "",
+                    "template": "default",
+                    "export_format": "markdown"
                 }
-                yaml.safe_dump(data, f)
-
-            # リロードして変更が反映されることを確認
-            config2 = manager.reload()
-            assert config2.database.path == "/external/change/data.db"
-            assert config2.database.path != original_path
-
-    def test_get_database_path_expansion(self):
+            }
+            # libyaml があれば C 実装のダンパーを使う (ConfigManager.save と同じ)
+            yaml.dump(data, f, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper))
+
+        # リロードして変更が反映されることを確認
+        config2 = manager.reload()
+        assert config2.database.path == "/external/change/data.db"
+        assert config2.database.path != original_path
+        # プロセス内のキャッシュも更新される
+        assert ConfigManager._parsed_cache[config_path][1] == config2
+
+    def test_load_reuses_parsed_config_in_process(self, fresh_config_manager):
+        """同じプロセスでは変更のない設定ファイルを読み直さないことを確認."""
+        manager = fresh_config_manager
+        config_path = manager.config_path
+        manager.set("editor.command", "nano")
+
+        with patch("yaml.load", side_effect=AssertionError("parsed")):
+            config = ConfigManager(config_path).load()
+        assert config.editor.command == "nano"
+        # キャッシュはプロセス内だけで, 設定ファイルの隣には何も書き込まない
+        assert list(config_path.parent.iterdir()) == [config_path]
+
+        # 返された設定を変更してもキャッシュには影響しない
+        config.editor.command = "code"
+        assert ConfigManager(config_path).get("editor.command") == "nano"
+
+    def test_load_ignores_stale_cache(self, tmp_path):
+        """設定ファイルが変更された場合はキャッシュを使わないことを確認."""
+        config_path = tmp_path / "config.yaml"
+        ConfigManager(config_path).load()
+
+        config_path.write_text("editor:\n  command: emacs\n", encoding="utf-8")
+
+        assert ConfigManager(config_path).get("editor.command") == "emacs"
+
+    def test_get_database_path_expansion(self, fresh_config_manager):
         """データベースパスの環境変数展開をテスト."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "config.yaml"
-            manager = ConfigManager(config_path)
+        manager = fresh_config_manager
 
-            # ホームディレクトリ展開をテスト
-            manager.set("database.path", "~/.smart-nippo/test.db")
-            expanded_path = manager.get_database_path()
+        # ホームディレクトリ展開をテスト
+        manager.set("database.path", "~/.smart-nippo/test.db")
+        expanded_path = manager.get_database_path()
 
-            assert "~" not in str(expanded_path)
-            assert ".smart-nippo/test.db" in str(expanded_path)
+        assert "~" not in str(expanded_path)
+        assert ".smart-nippo/test.db" in str(expanded_path)
 
-    def test_get_editor_command_env_override(self):
+    def test_get_editor_command_env_override(
+        self, readonly_config_manager, monkeypatch
+    ):
         """環境変数でのエディタコマンド上書きをテスト."""
-        import os
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config_path = Path(temp_dir) / "config.yaml"
-            manager = ConfigManager(config_path)
-
-            # 環境変数がない場合は設定ファイルの値
-            assert manager.get_editor_command() == "vim"
-
-            # 環境変数を設定
-            old_editor = os.environ.get("EDITOR")
-            try:
-                os.environ["EDITOR"] = "emacs"
-                assert manager.get_editor_command() == "emacs"
-            finally:
-                # 環境変数を元に戻す
-                if old_editor is not None:
-                    os.environ["EDITOR"] = old_editor
-                elif "EDITOR" in os.environ:
-                    del os.environ["EDITOR"]
+        manager = readonly_config_manager
+
+        # 環境変数がない場合は設定ファイルの値
+        monkeypatch.delenv("EDITOR", raising=False)
+        assert manager.get_editor_command() == "vim"
+
+        # 環境変数を設定 (テスト終了時に元に戻る)
+        monkeypatch.setenv("EDITOR", "emacs")
+        assert manager.get_editor_command() == "emacs"
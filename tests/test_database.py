@@ -1,10 +1,14 @@
 """Tests for database functionality."""
 
-import tempfile
-from pathlib import Path
+import json
+from datetime import date, datetime
+from unittest.mock import patch
 
 import pytest
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
 
+from smart_nippo.core import jsonutil
 from smart_nippo.core.database import (
     DatabaseManager,
     ReportDB,
@@ -12,6 +16,7 @@ from smart_nippo.core.database import (
     TemplateFieldDB,
     create_tables,
     database_exists,
+    ensure_database,
     get_session,
     init_database,
     reset_database,
@@ -19,6 +24,13 @@ from smart_nippo.core.database import (
 from smart_nippo.core.models.field_types import FieldType
 
 
+def _default_template(session: Session) -> TemplateDB | None:
+    """デフォルトテンプレートを取得 (部分インデックスで1行だけ引く)."""
+    return session.scalar(
+        select(TemplateDB).where(TemplateDB.is_default.is_(True)).limit(1)
+    )
+
+
 class TestDatabaseManager:
     """DatabaseManagerクラスのテスト."""
 
@@ -28,34 +40,85 @@ class TestDatabaseManager:
         assert manager.database_path.name == "data.db"
         assert ".smart-nippo" in str(manager.database_path)
 
-    def test_custom_database_path(self):
+    def test_custom_database_path(self, tmp_path):
         """カスタムのデータベースパスが正しく設定されることを確認."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            custom_path = Path(temp_dir) / "test.db"
-            manager = DatabaseManager(custom_path)
-            assert manager.database_path == custom_path
+        custom_path = tmp_path / "test.db"
+        manager = DatabaseManager(custom_path)
+        assert manager.database_path == custom_path
 
-    def test_initialize(self):
+    def test_initialize(self, tmp_path):
         """データベースの初期化が正しく動作することを確認."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            db_path = Path(temp_dir) / "test.db"
-            manager = DatabaseManager(db_path)
+        db_path = tmp_path / "test.db"
+        manager = DatabaseManager(db_path)
 
-            manager.initialize()
+        manager.initialize()
 
-            assert manager.engine is not None
-            assert manager.SessionLocal is not None
-            assert db_path.parent.exists()
+        assert manager.engine is not None
+        assert manager.SessionLocal is not None
+        assert db_path.parent.exists()
 
-    def test_get_session(self):
+    def test_get_session(self, tmp_path):
         """セッション取得が正しく動作することを確認."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            db_path = Path(temp_dir) / "test.db"
-            manager = DatabaseManager(db_path)
-            manager.initialize()
-
+        db_path = tmp_path / "test.db"
+        manager = DatabaseManager(db_path)
+        manager.initialize()
+
+        with manager.get_session() as session:
+            assert session is not None
+
+    def test_sqlite_pragmas(self, tmp_path):
+        """接続時に WAL モードなどの PRAGMA が設定されることを確認."""
+        manager = DatabaseManager(tmp_path / "test.db")
+        manager.initialize()
+        try:
             with manager.get_session() as session:
-                assert session is not None
+                journal_mode = session.execute(text("PRAGMA journal_mode"))
+                assert journal_mode.scalar() == "wal"
+                synchronous = session.execute(text("PRAGMA synchronous"))
+                assert synchronous.scalar() == 1  # NORMAL
+        finally:
+            manager.close()
+
+    def test_table_names_cached(self, tmp_path):
+        """テーブル名が破棄されるまでキャッシュされることを確認."""
+        from smart_nippo.core.database import Base
+
+        manager = DatabaseManager(tmp_path / "test.db")
+        manager.initialize()
+        try:
+            assert manager.table_names() == set()
+
+            Base.metadata.create_all(bind=manager.engine)
+            assert manager.table_names() == set()
+
+            manager.clear_table_cache()
+            assert "reports" in manager.table_names()
+        finally:
+            manager.close()
+
+    def test_get_database_manager_is_shared(self):
+        """グローバルなマネージャーが同じインスタンスを返すことを確認."""
+        from smart_nippo.core.database.session import get_database_manager
+
+        manager = get_database_manager()
+        assert manager is get_database_manager()
+        assert manager.engine is not None
+
+    def test_in_memory_database(self):
+        """":memory:" を指定すると接続をまたいで同じインメモリ DB を使うことを確認."""
+        from smart_nippo.core.database import Base
+
+        manager = DatabaseManager(":memory:")
+        manager.initialize()
+        try:
+            assert manager.in_memory
+            Base.metadata.create_all(bind=manager.engine)
+            with manager.get_session() as session:
+                session.add(TemplateDB(name="memory", is_default=False))
+            with manager.get_session() as session:
+                assert session.query(TemplateDB).filter_by(name="memory").count() == 1
+        finally:
+            manager.close()
 
     def test_get_session_before_initialize(self):
         """初期化前のセッション取得でエラーが発生することを確認."""
@@ -66,21 +129,53 @@ class TestDatabaseManager:
                 pass
 
 
-class TestDatabaseModels:
-    """データベースモデルのテスト."""
-
-    @pytest.fixture(autouse=True)
-    def setup_database(self):
-        """テスト用データベースのセットアップ."""
-        reset_database()
-        yield
-        # テスト後のクリーンアップは不要（一時ファイル使用のため）
+@pytest.mark.usefixtures("fresh_db")
+class TestDatabaseSchema:
+    """スキーマの作成・初期化・更新のテスト (テストごとに初期状態に戻す)."""
 
     def test_create_tables(self):
         """テーブル作成が正しく動作することを確認."""
         create_tables()
         assert database_exists()
 
+    def test_indexes_created(self):
+        """外部キーと表示順の検索用インデックスが作成されることを確認."""
+        from sqlalchemy import inspect
+
+        from smart_nippo.core.database.session import get_database_manager
+
+        inspector = inspect(get_database_manager().engine)
+
+        def index_columns(table):
+            return {
+                index["name"]: index["column_names"]
+                for index in inspector.get_indexes(table)
+            }
+
+        assert index_columns("template_fields")["ix_template_fields_tmpl_order"] == [
+            "template_id",
+            "order",
+        ]
+        report_indexes = index_columns("reports")
+        assert report_indexes["ix_reports_tmpl_created"] == [
+            "template_id",
+            "created_at",
+        ]
+        assert report_indexes["ix_reports_project"] == ["project_id"]
+
+    def test_default_template_lookup_uses_partial_index(self):
+        """デフォルトテンプレートの検索で部分インデックスが使われることを確認."""
+        from smart_nippo.core.database.session import get_database_manager
+
+        query = select(TemplateDB).filter_by(is_default=True)
+        engine = get_database_manager().engine
+        compiled = query.compile(engine)
+        with engine.connect() as conn:
+            plan = conn.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {compiled}", tuple(compiled.params.values())
+            ).fetchall()
+        assert any("ix_templates_is_default" in row[-1] for row in plan)
+
     def test_init_database(self):
         """データベース初期化が正しく動作することを確認."""
         init_database()
@@ -96,10 +191,164 @@ class TestDatabaseModels:
             assert default_template is not None
             assert default_template.name == "標準テンプレート"
 
+    def test_default_fields_inserted_in_one_statement(self):
+        """デフォルトテンプレートのフィールドが1文でまとめて挿入されることを確認."""
+        from sqlalchemy import event
+
+        from smart_nippo.core.database.session import get_database_manager
+
+        engine = get_database_manager().engine
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT INTO template_fields"):
+                statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            reset_database()
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+        assert len(statements) == 1
+        with get_session() as session:
+            template = session.query(TemplateDB).filter_by(is_default=True).one()
+            assert len(template.fields) == 9
+            progress = next(f for f in template.fields if f.name == "progress")
+            assert progress.options == ["完了", "進行中", "未着手"]
+
+    @staticmethod
+    def _make_legacy_reports(dates: list[str]) -> None:
+        """report_date 列がなかった頃のスキーマを再現し, 日報を登録."""
+        from smart_nippo.core.database.session import get_database_manager
+
+        with get_database_manager().engine.begin() as conn:
+            conn.execute(text("DROP INDEX uq_reports_tmpl_date"))
+            conn.execute(text("DROP INDEX ix_reports_report_date"))
+            conn.execute(text("ALTER TABLE reports DROP COLUMN report_date"))
+            for report_date in dates:
+                conn.execute(
+                    text(
+                        "INSERT INTO reports (template_id, data_json, created_at, "
+                        "updated_at) VALUES (1, :data, CURRENT_TIMESTAMP, "
+                        "CURRENT_TIMESTAMP)"
+                    ),
+                    {"data": json.dumps({"date": report_date})},
+                )
+
+    def test_upgrade_schema_adds_report_date(self):
+        """旧スキーマに report_date 列を追加し, データの日付で埋め戻すことを確認."""
+        from sqlalchemy import inspect
+
+        from smart_nippo.core.database import upgrade_schema
+        from smart_nippo.core.database.session import get_database_manager
+
+        engine = get_database_manager().engine
+        self._make_legacy_reports(["2024-01-15"])
+
+        upgrade_schema()
+
+        columns = {c["name"] for c in inspect(engine).get_columns("reports")}
+        assert "report_date" in columns
+        index_names = {i["name"] for i in inspect(engine).get_indexes("reports")}
+        assert "uq_reports_tmpl_date" in index_names
+        with get_session() as session:
+            report = session.query(ReportDB).one()
+            assert report.report_date == date(2024, 1, 15)
+
+    def test_upgrade_schema_resolves_duplicate_dates(self):
+        """同じ日付の日報が複数ある旧データベースも更新できることを確認."""
+        from smart_nippo.core.database import upgrade_schema
+
+        self._make_legacy_reports(["2024-01-15", "2024-01-15", "2024-01-16"])
+
+        upgrade_schema()
+
+        with get_session() as session:
+            reports = session.query(ReportDB).order_by(ReportDB.id).all()
+            assert [r.report_date for r in reports] == [
+                date(2024, 1, 15),
+                None,
+                date(2024, 1, 16),
+            ]
+            # 日付が NULL になった日報もデータの日付で表示できる
+            assert reports[1].get_date() == "2024-01-15"
+
+    def test_upgrade_schema_is_atomic(self, monkeypatch):
+        """途中で失敗した場合は列の追加も取り消され, 再実行で更新されることを確認."""
+        from sqlalchemy import Index, inspect
+
+        from smart_nippo.core.database import upgrade_schema
+        from smart_nippo.core.database.session import get_database_manager
+
+        engine = get_database_manager().engine
+        self._make_legacy_reports(["2024-01-15"])
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("index creation failed")
+
+        with monkeypatch.context() as m:
+            m.setattr(Index, "create", fail)
+            with pytest.raises(RuntimeError):
+                upgrade_schema()
+
+        columns = {c["name"] for c in inspect(engine).get_columns("reports")}
+        assert "report_date" not in columns
+
+        upgrade_schema()
+        with get_session() as session:
+            assert session.query(ReportDB).one().report_date == date(2024, 1, 15)
+
+    def test_ensure_database_checks_once(self, monkeypatch):
+        """ensure_database は存在確認を一度だけ行うことを確認."""
+        from smart_nippo.core.database import init as db_init
+
+        monkeypatch.setattr(db_init, "_database_ready", False)
+        calls = []
+        monkeypatch.setattr(
+            db_init, "database_exists", lambda: calls.append(1) or True
+        )
+
+        assert ensure_database() is False
+        assert ensure_database() is False
+        assert len(calls) == 1
+
+
+@pytest.mark.usefixtures("db_session")
+class TestDatabaseModels:
+    """データベースモデルのテスト (テストごとにロールバックする)."""
+
+    def test_attributes_not_expired_on_commit(self):
+        """コミット後の属性参照で再読み込みの SELECT が発生しないことを確認."""
+        from sqlalchemy import event
+
+        from smart_nippo.core.database.session import get_database_manager
+
+        engine = get_database_manager().engine
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        with get_session() as session:
+            template = TemplateDB(name="コミット後テンプレート")
+            session.add(template)
+            session.commit()
+
+            event.listen(engine, "before_cursor_execute", count)
+            try:
+                assert template.id is not None
+                assert template.name == "コミット後テンプレート"
+                # 日時は DB 側の CURRENT_TIMESTAMP で設定され RETURNING で受け取る
+                assert isinstance(template.created_at, datetime)
+                assert isinstance(template.updated_at, datetime)
+            finally:
+                event.remove(engine, "before_cursor_execute", count)
+
+        assert statements == []
+
     def test_template_model(self):
         """TemplateDBモデルの基本機能をテスト."""
-        init_database()
-
         with get_session() as session:
             template = TemplateDB(
                 name="テストテンプレート",
@@ -119,17 +368,9 @@ class TestDatabaseModels:
 
     def test_template_field_model(self):
         """TemplateFieldDBモデルの基本機能をテスト."""
-        init_database()
-
         with get_session() as session:
-            # テンプレートを作成
-            template = TemplateDB(name="テストテンプレート")
-            session.add(template)
-            session.flush()
-
             # フィールドを作成
             field = TemplateFieldDB(
-                template_id=template.id,
                 name="test_field",
                 label="テストフィールド",
                 field_type=FieldType.TEXT.value,
@@ -137,7 +378,8 @@ class TestDatabaseModels:
                 max_length=100,
                 order=1,
             )
-            session.add(field)
+            # テンプレートとフィールドを1回の flush でまとめて追加
+            session.add(TemplateDB(name="テストテンプレート", fields=[field]))
             session.commit()
 
             # 取得してチェック
@@ -150,16 +392,9 @@ class TestDatabaseModels:
 
     def test_template_field_options(self):
         """TemplateFieldDBの選択肢機能をテスト."""
-        init_database()
-
         with get_session() as session:
-            template = TemplateDB(name="テストテンプレート")
-            session.add(template)
-            session.flush()
-
             # 選択型フィールドを作成
             field = TemplateFieldDB(
-                template_id=template.id,
                 name="status",
                 label="ステータス",
                 field_type=FieldType.SELECTION.value,
@@ -167,7 +402,7 @@ class TestDatabaseModels:
 
             # 選択肢を設定
             field.options = ["完了", "進行中", "未着手"]
-            session.add(field)
+            session.add(TemplateDB(name="テストテンプレート", fields=[field]))
             session.commit()
 
             # 取得してチェック
@@ -176,14 +411,17 @@ class TestDatabaseModels:
             ).first()
             assert saved_field is not None
             assert saved_field.options == ["完了", "進行中", "未着手"]
+            # 非 ASCII 文字はエスケープせず, 区切りの空白なしで保存される
+            raw = session.execute(
+                text("SELECT options_json FROM template_fields WHERE name = 'status'")
+            ).scalar_one()
+            assert raw == '["完了","進行中","未着手"]'
 
     def test_report_model(self):
         """ReportDBモデルの基本機能をテスト."""
-        init_database()
-
         with get_session() as session:
             # デフォルトテンプレートを取得
-            template = session.query(TemplateDB).filter_by(is_default=True).first()
+            template = _default_template(session)
             assert template is not None
 
             # 日報を作成
@@ -201,7 +439,7 @@ class TestDatabaseModels:
             session.commit()
 
             # 取得してチェック
-            saved_report = session.query(ReportDB).first()
+            saved_report = session.get(ReportDB, report.id)
             assert saved_report is not None
             assert saved_report.get_date() == "2024-01-15"
             assert saved_report.get_project_name() == "テストプロジェクト"
@@ -209,10 +447,8 @@ class TestDatabaseModels:
 
     def test_report_data_operations(self):
         """ReportDBのデータ操作をテスト."""
-        init_database()
-
         with get_session() as session:
-            template = session.query(TemplateDB).filter_by(is_default=True).first()
+            template = _default_template(session)
 
             report = ReportDB(
                 template_id=template.id,
@@ -227,6 +463,55 @@ class TestDatabaseModels:
             session.commit()
 
             # データが正しく保存されているかチェック
-            saved_report = session.query(ReportDB).filter_by(id=report.id).first()
+            saved_report = session.get(ReportDB, report.id)
             assert saved_report.get_field_value("project") == "新プロジェクト"
             assert saved_report.get_field_value("content") == "新しい作業内容"
+
+    def test_report_data_is_decoded_once(self):
+        """日報データは読み込み時に一度だけデコードされることを確認."""
+        with get_session() as session:
+            template = _default_template(session)
+            session.add(
+                ReportDB(
+                    template_id=template.id,
+                    data={"date": "2024-01-16", "project": "A"},
+                )
+            )
+
+        with get_session() as session:
+            with patch(
+                "smart_nippo.core.database.models.jsonutil.loads",
+                wraps=jsonutil.loads,
+            ) as loads:
+                report = session.query(ReportDB).one()
+                assert report.get_date() == "2024-01-16"
+                assert report.get_project_name() == "A"
+                assert report.get_field_value("content") is None
+                assert loads.call_count == 1
+
+                report.set_field_value("content", "作業")
+                assert report.get_field_value("content") == "作業"
+                assert loads.call_count == 1
+
+        with get_session() as session:
+            raw = session.execute(text("SELECT data_json FROM reports")).scalar_one()
+            assert json.loads(raw) == {
+                "date": "2024-01-16",
+                "project": "A",
+                "content": "作業",
+            }
+
+    def test_data_field_expression(self):
+        """data_field で日報データ内の値を検索できることを確認."""
+        with get_session() as session:
+            template = _default_template(session)
+            session.add(ReportDB(template_id=template.id, data={"date": "2024-01-15"}))
+            session.add(ReportDB(template_id=template.id, data={"date": "2024-01-16"}))
+
+        with get_session() as session:
+            reports = (
+                session.query(ReportDB)
+                .filter(ReportDB.data_field("date") == "2024-01-16")
+                .all()
+            )
+            assert [r.get_date() for r in reports] == ["2024-01-16"]
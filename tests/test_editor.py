@@ -0,0 +1,32 @@
+"""Tests for editor command"""
+
+import os
+from unittest.mock import patch
+
+
+class TestEditorCommand:
+    """Test editor command functionality"""
+
+    @patch("click.edit", return_value="line1\nline2\n")
+    def test_edit_shows_result(self, mock_edit, runner, app):
+        """Test edited content is displayed with line and char counts"""
+        result = runner.invoke(app, ["edit"])
+        assert result.exit_code == 0
+        assert "2 行" in result.stdout
+        assert "11 文字" in result.stdout
+        assert "line1" in result.stdout
+
+    @patch("click.edit", return_value="text")
+    def test_edit_passes_editor_without_touching_environ(self, mock_edit, runner, app):
+        """Test --editor is passed to click.edit and EDITOR is left unchanged"""
+        original = os.environ.get("EDITOR")
+        result = runner.invoke(app, ["edit", "--editor", "nano"])
+        assert result.exit_code == 0
+        assert mock_edit.call_args.kwargs["editor"] == "nano"
+        assert os.environ.get("EDITOR") == original
+
+    @patch("click.edit", return_value=None)
+    def test_edit_not_saved(self, mock_edit, runner, app):
+        """Test exit code is 1 when the editor is closed without saving"""
+        result = runner.invoke(app, ["edit"])
+        assert result.exit_code == 1
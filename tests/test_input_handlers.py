@@ -0,0 +1,157 @@
+"""Tests for interactive input handlers."""
+
+import subprocess
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from smart_nippo.cli.interactive import (
+    DateInputHandler,
+    MemoInputHandler,
+    TextInputHandler,
+    collect_report_data,
+)
+from smart_nippo.core.models import FieldType, Template, TemplateField
+
+
+def _editor_writing(text: str):
+    """指定したテキストを一時ファイルに書き込むエディタの代用."""
+
+    def run(args, check):
+        Path(args[1]).write_text(text, encoding="utf-8")
+        return subprocess.CompletedProcess(args, 0)
+
+    return run
+
+
+class TestMemoInputHandler:
+    """MemoInputHandler の外部エディタ入力のテスト."""
+
+    field = TemplateField(
+        name="content",
+        label="作業内容",
+        field_type=FieldType.MEMO,
+        required=False,
+        placeholder="今日の作業内容",
+    )
+
+    def test_placeholder_line_is_removed(self):
+        """先頭のプレースホルダー行が取り除かれることを確認."""
+        handler = MemoInputHandler(self.field)
+        editor = _editor_writing("# 今日の作業内容\n\n実装\nレビュー\n")
+        with patch("subprocess.run", side_effect=editor):
+            assert handler._open_editor(None) == "実装\nレビュー"
+
+    def test_content_without_placeholder_is_kept(self):
+        """プレースホルダー行を消した場合は入力内容がそのまま残ることを確認."""
+        handler = MemoInputHandler(self.field)
+        editor = _editor_writing("実装\nレビュー\n")
+        with patch("subprocess.run", side_effect=editor):
+            assert handler._open_editor(None) == "実装\nレビュー"
+
+    def test_only_placeholder_returns_none(self):
+        """プレースホルダーのみの場合は None を返すことを確認."""
+        handler = MemoInputHandler(self.field)
+        editor = _editor_writing("# 今日の作業内容\n\n")
+        with patch("subprocess.run", side_effect=editor):
+            assert handler._open_editor(None) is None
+
+    def test_placeholder_without_newline_returns_none(self):
+        """末尾に改行のないプレースホルダーのみの場合も None を返すことを確認."""
+        handler = MemoInputHandler(self.field)
+        editor = _editor_writing("# 今日の作業内容")
+        with patch("subprocess.run", side_effect=editor):
+            assert handler._open_editor(None) is None
+
+    def test_editor_failure_keeps_current_value(self):
+        """エディタが異常終了した場合は元の値を返すことを確認."""
+        handler = MemoInputHandler(self.field)
+        failed = subprocess.CompletedProcess([], 1)
+        with patch("subprocess.run", return_value=failed):
+            assert handler._open_editor("既存のメモ") == "既存のメモ"
+
+    def test_missing_editor_keeps_current_value(self, capsys):
+        """エディタが見つからない場合は起動失敗を表示して元の値を返すことを確認."""
+        handler = MemoInputHandler(self.field)
+        missing = FileNotFoundError(2, "No such file or directory", "no-such-editor")
+        with patch("subprocess.run", side_effect=missing):
+            assert handler._open_editor("既存のメモ") == "既存のメモ"
+        assert "エディタの起動に失敗しました" in capsys.readouterr().out
+
+
+class TestTextInputHandler:
+    """TextInputHandler の入力検証のテスト."""
+
+    def test_validate_required(self):
+        """必須項目が空の場合はエラーメッセージを返すことを確認."""
+        field = TemplateField(name="p", label="P", field_type=FieldType.TEXT)
+        handler = TextInputHandler(field)
+        assert handler._validate_text("") == "この項目は必須です"
+        assert handler._validate_text("abc") is True
+
+    def test_validate_max_length(self):
+        """最大文字数を超えた場合はエラーメッセージを返すことを確認."""
+        field = TemplateField(
+            name="p",
+            label="P",
+            field_type=FieldType.TEXT,
+            required=False,
+            max_length=3,
+        )
+        handler = TextInputHandler(field)
+        assert handler._validate_text("") is True
+        assert handler._validate_text("abc") is True
+        assert handler._validate_text("abcd") == "最大3文字まで入力できます"
+
+
+def _select_returning(value: str):
+    """questionary.select の代用 (ask() が指定値を返す)."""
+    question = MagicMock()
+    question.ask.return_value = value
+    return MagicMock(return_value=question)
+
+
+class TestDateInputHandler:
+    """DateInputHandler の入力検証のテスト."""
+
+    field = TemplateField(name="date", label="日付", field_type=FieldType.DATE)
+
+    def test_existing_value_is_returned(self):
+        """正しい形式の既存値を選択した場合はそのまま返すことを確認."""
+        handler = DateInputHandler(self.field)
+        with patch("questionary.select", _select_returning("2024-01-15")):
+            assert handler.get_input("2024-01-15") == "2024-01-15"
+
+    def test_invalid_existing_value_is_rejected(self):
+        """不正な形式の既存値を選択した場合は ValueError になることを確認."""
+        handler = DateInputHandler(self.field)
+        with patch("questionary.select", _select_returning("2024/01/15")):
+            with pytest.raises(ValueError, match="無効な日付形式です"):
+                handler.get_input("2024/01/15")
+
+
+class TestCollectReportData:
+    """collect_report_data の入力中断のテスト."""
+
+    @pytest.mark.parametrize("required", [True, False])
+    def test_invalid_existing_date_stops_with_one_error(self, required, capsys):
+        """既存の日付が不正な場合は入力形式エラーを1回だけ表示して中断することを確認."""
+        template = Template(
+            name="日報",
+            fields=[
+                TemplateField(
+                    name="date",
+                    label="日付",
+                    field_type=FieldType.DATE,
+                    required=required,
+                    order=1,
+                )
+            ],
+        )
+        with patch("questionary.select", _select_returning("2024/01/15")):
+            assert collect_report_data(template, {"date": "2024/01/15"}) is None
+
+        out = capsys.readouterr().out
+        assert out.count("入力形式エラー") == 1
+        assert "必須項目です。入力をキャンセルしました。" not in out
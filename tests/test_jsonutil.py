@@ -0,0 +1,51 @@
+"""Tests for JSON serialization helpers."""
+
+import json
+
+from smart_nippo.core import jsonutil
+
+
+class TestJsonUtil:
+    """jsonutil のテスト."""
+
+    data = {"name": "標準テンプレート", "fields": [{"order": 1, "options": None}]}
+
+    def test_dumps_matches_stdlib(self):
+        """標準ライブラリの json (空白なし) と同じ出力になることを確認."""
+        assert jsonutil.dumps(self.data) == json.dumps(
+            self.data, ensure_ascii=False, separators=(",", ":")
+        )
+
+    def test_dumps_without_orjson(self, monkeypatch):
+        """orjson がない場合も同じ出力になることを確認."""
+        expected = jsonutil.dumps(self.data, indent=True)
+        monkeypatch.setattr(jsonutil, "orjson", None)
+        assert jsonutil.dumps(self.data, indent=True) == expected
+        assert jsonutil.dumps_bytes(self.data) == json.dumps(
+            self.data, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    def test_dumps_indent_matches_stdlib(self):
+        """インデント付き出力が json.dumps(indent=2) と一致することを確認."""
+        assert jsonutil.dumps(self.data, indent=True) == json.dumps(
+            self.data, ensure_ascii=False, indent=2
+        )
+
+    def test_dumps_bytes_is_utf8(self):
+        """バイト列が UTF-8 でエンコードされることを確認."""
+        result = jsonutil.dumps_bytes(self.data)
+        assert json.loads(result.decode("utf-8")) == self.data
+        assert "標準テンプレート".encode() in result
+
+    def test_loads_roundtrip(self):
+        """loads が dumps の出力を元に戻せることを確認."""
+        text = jsonutil.dumps(self.data)
+        assert jsonutil.loads(text) == self.data
+        assert jsonutil.loads(text.encode("utf-8")) == self.data
+
+    def test_loads_without_orjson(self, monkeypatch):
+        """orjson がない場合も同じ結果になることを確認."""
+        text = '{"date": "2024-01-15", "project": "テスト"}'
+        expected = jsonutil.loads(text)
+        monkeypatch.setattr(jsonutil, "orjson", None)
+        assert jsonutil.loads(text) == expected
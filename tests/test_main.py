@@ -1,20 +1,20 @@
 """Tests for main CLI application"""
 
-from typer.testing import CliRunner
+import pytest
 
-from smart_nippo.cli.main import app
 
-runner = CliRunner()
-
-
-def test_app_help():
-    """Test main application help"""
-    result = runner.invoke(app, ["--help"])
-    assert result.exit_code == 0
-    assert "日報入力支援ツール" in result.stdout
-
-
-def test_app_version():
-    """Test that app loads without errors"""
-    result = runner.invoke(app, ["--help"])
+@pytest.mark.parametrize(
+    "cmd,expected_substr",
+    [
+        (["--help"], "日報入力支援ツール"),
+        (["hello", "--help"], "Hello World コマンド"),
+        (["copy", "--help"], "指定されたテキストをクリップボードにコピーします"),
+        (["paste", "--help"], "クリップボードの内容を表示します"),
+    ],
+    ids=["app", "hello", "copy", "paste"],
+)
+def test_help_texts(runner, app, cmd, expected_substr):
+    """Test the app and each command render their help text"""
+    result = runner.invoke(app, cmd)
     assert result.exit_code == 0
+    assert expected_substr in result.stdout
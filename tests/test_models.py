@@ -1,6 +1,12 @@
 """Tests for core models."""
 
+import re
+import subprocess
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import date, timedelta
+from unittest.mock import patch
 
 import pytest
 
@@ -11,7 +17,152 @@ from smart_nippo.core.models import (
     TemplateField,
 )
 from smart_nippo.core.models.template import create_default_template
-from smart_nippo.core.validators import FieldValidator, validate_report_data
+from smart_nippo.core.validators import (
+    FieldValidator,
+    parse_date,
+    validate_report_data,
+)
+
+# 正規表現が必要なメッセージだけ pytest.raises の match を使う
+_CONTENT_REQUIRED_RE = re.compile("内容: .* は必須項目")
+
+
+@contextmanager
+def raises_with(
+    exc: type[BaseException], substring: str
+) -> Iterator[pytest.ExceptionInfo]:
+    """例外が送出され, メッセージに substring が含まれることを確認 (正規表現なし)."""
+    with pytest.raises(exc) as excinfo:
+        yield excinfo
+    assert substring in str(excinfo.value)
+
+
+# 日付のデフォルト値のテストで「今日」として使う日付
+_FROZEN_TODAY = date(2024, 6, 1)
+# 期待値は収集時に一度だけ計算する
+_TODAY = _FROZEN_TODAY.isoformat()
+_YESTERDAY = (_FROZEN_TODAY - timedelta(days=1)).isoformat()
+_TOMORROW = (_FROZEN_TODAY + timedelta(days=1)).isoformat()
+
+
+class _FrozenDate(date):
+    """today() が常に _FROZEN_TODAY を返す date."""
+
+    @classmethod
+    def today(cls) -> date:
+        return _FROZEN_TODAY
+
+
+@pytest.fixture
+def frozen_today(monkeypatch: pytest.MonkeyPatch) -> date:
+    """検証モジュールの date.today() を固定する."""
+    monkeypatch.setattr("smart_nippo.core.validators.date", _FrozenDate)
+    return _FROZEN_TODAY
+
+
+# 検証のテストで共有するフィールド (テストでは変更しないためモジュールで一度だけ作成)
+@pytest.fixture(scope="module")
+def date_field() -> TemplateField:
+    """日付型フィールド."""
+    return TemplateField(name="date", label="日付", field_type=FieldType.DATE)
+
+
+@pytest.fixture(scope="module")
+def date_default_field() -> TemplateField:
+    """デフォルト値が today の日付型フィールド."""
+    return TemplateField(
+        name="date",
+        label="日付",
+        field_type=FieldType.DATE,
+        default_value=DateDefault.TODAY.value,
+    )
+
+
+@pytest.fixture(scope="module")
+def time_field() -> TemplateField:
+    """時刻型フィールド."""
+    return TemplateField(
+        name="start_time", label="開始時刻", field_type=FieldType.TIME
+    )
+
+
+@pytest.fixture(scope="module")
+def text_field() -> TemplateField:
+    """最大10文字のテキスト型フィールド."""
+    return TemplateField(
+        name="project",
+        label="プロジェクト",
+        field_type=FieldType.TEXT,
+        max_length=10,
+    )
+
+
+@pytest.fixture(scope="module")
+def selection_field() -> TemplateField:
+    """選択型フィールド."""
+    return TemplateField(
+        name="status",
+        label="ステータス",
+        field_type=FieldType.SELECTION,
+        options=["完了", "進行中", "未着手"],
+    )
+
+
+@pytest.fixture(scope="module")
+def required_content_field() -> TemplateField:
+    """必須のテキスト型フィールド."""
+    return TemplateField(
+        name="content",
+        label="内容",
+        field_type=FieldType.TEXT,
+        required=True,
+    )
+
+
+@pytest.fixture(scope="module")
+def report_fields() -> list[TemplateField]:
+    """必須の日付と内容からなる日報のフィールド."""
+    return [
+        TemplateField(
+            name="date",
+            label="日付",
+            field_type=FieldType.DATE,
+            required=True,
+        ),
+        TemplateField(
+            name="content",
+            label="内容",
+            field_type=FieldType.MEMO,
+            required=True,
+        ),
+    ]
+
+
+class TestLazyModels:
+    """core.models の遅延読み込みのテスト."""
+
+    def test_field_types_do_not_load_models(self):
+        """FieldType のみの import ではモデルモジュールを読み込まないことを確認."""
+        code = (
+            "import sys\n"
+            "from smart_nippo.core.models import FieldType\n"
+            "assert 'smart_nippo.core.models.report' not in sys.modules\n"
+            "assert 'smart_nippo.core.models.template' not in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_report_forward_reference_resolved(self):
+        """遅延読み込み時に Report の前方参照が解決されることを確認."""
+        from smart_nippo.core.models import Report
+
+        template = Template(
+            name="参照テスト",
+            fields=[
+                TemplateField(name="a", label="A", field_type=FieldType.TEXT)
+            ],
+        )
+        report = Report(template_id=1, template=template, data={"a": "x"})
+        assert report.template.name == "参照テスト"
 
 
 class TestFieldTypes:
@@ -31,6 +182,12 @@ class TestFieldTypes:
         assert DateDefault.YESTERDAY.value == "yesterday"
         assert DateDefault.TOMORROW.value == "tomorrow"
 
+    def test_enums_compare_as_str(self):
+        """列挙値が文字列としてそのまま比較できることを確認."""
+        assert FieldType.SELECTION == "selection"
+        assert DateDefault.TODAY == "today"
+        assert FieldType("memo") is FieldType.MEMO
+
 
 class TestTemplateField:
     """TemplateFieldモデルのテスト."""
@@ -62,24 +219,43 @@ class TestTemplateField:
         assert field.options == ["完了", "進行中", "未着手"]
         assert field.default_value == "進行中"
 
-    def test_selection_field_without_options(self):
-        """選択型フィールドでoptionsが未指定の場合エラー."""
-        with pytest.raises(ValueError, match="選択肢（options）が必要"):
-            TemplateField(
-                name="status",
-                label="ステータス",
-                field_type=FieldType.SELECTION,
-            )
-
-    def test_text_field_max_length_limit(self):
-        """テキスト型フィールドの最大文字数制限."""
-        with pytest.raises(ValueError, match="最大文字数は255文字"):
-            TemplateField(
-                name="title",
-                label="タイトル",
-                field_type=FieldType.TEXT,
-                max_length=300,
-            )
+    @pytest.mark.parametrize(
+        "kwargs,msg",
+        [
+            (
+                {
+                    "name": "status",
+                    "label": "ステータス",
+                    "field_type": FieldType.SELECTION,
+                },
+                "選択肢（options）が必要",
+            ),
+            (
+                {
+                    "name": "title",
+                    "label": "タイトル",
+                    "field_type": FieldType.TEXT,
+                    "max_length": 300,
+                },
+                "最大文字数は255文字",
+            ),
+        ],
+        ids=["selection_without_options", "text_max_length_limit"],
+    )
+    def test_invalid_field_kwargs(self, kwargs, msg):
+        """不正な組み合わせのフィールドはエラー (新しい検証規則は行を追加する)."""
+        with raises_with(ValueError, msg):
+            TemplateField(**kwargs)
+
+    def test_memo_field_max_length_not_limited(self):
+        """テキスト型以外では最大文字数の上限をチェックしないことを確認."""
+        field = TemplateField(
+            name="content",
+            label="内容",
+            field_type=FieldType.MEMO,
+            max_length=1000,
+        )
+        assert field.max_length == 1000
 
 
 class TestTemplate:
@@ -124,9 +300,21 @@ class TestTemplate:
                 field_type=FieldType.DATE,
             ),
         ]
-        with pytest.raises(ValueError, match="フィールド名が重複"):
+        with raises_with(ValueError, "フィールド名が重複"):
             Template(name="重複テスト", fields=fields)
 
+    def test_sorted_fields(self):
+        """sorted_fields が表示順に並び, 結果がキャッシュされることを確認."""
+        fields = [
+            TemplateField(name="b", label="B", field_type=FieldType.TEXT, order=2),
+            TemplateField(name="a", label="A", field_type=FieldType.TEXT, order=1),
+        ]
+        template = Template(name="順序テスト", fields=fields)
+
+        assert [f.name for f in template.sorted_fields] == ["a", "b"]
+        assert template.sorted_fields is template.sorted_fields
+        assert "sorted_fields" not in template.model_dump()
+
     def test_create_default_template(self):
         """デフォルトテンプレートの作成."""
         template = create_default_template()
@@ -139,160 +327,170 @@ class TestTemplate:
         assert date_field.required is True
         assert date_field.field_type == FieldType.DATE
 
+    def test_create_default_template_returns_copy(self):
+        """デフォルトテンプレートは呼び出しごとに独立した複製を返すことを確認."""
+        template = create_default_template()
+        template.fields[0].label = "変更"
 
-class TestFieldValidator:
-    """FieldValidatorのテスト."""
-
-    def test_validate_date_with_default(self):
-        """日付型のデフォルト値検証."""
-        field = TemplateField(
-            name="date",
-            label="日付",
-            field_type=FieldType.DATE,
-            default_value=DateDefault.TODAY.value,
-        )
-        result = FieldValidator.validate_date("today", field)
-        assert result == date.today().isoformat()
+        fresh = create_default_template()
+        assert fresh is not template
+        assert fresh.fields[0].label == "日付"
 
-        result = FieldValidator.validate_date("yesterday", field)
-        assert result == (date.today() - timedelta(days=1)).isoformat()
 
-    def test_validate_date_with_value(self):
-        """日付型の値検証."""
-        field = TemplateField(
-            name="date",
-            label="日付",
-            field_type=FieldType.DATE,
-        )
-        result = FieldValidator.validate_date("2024-01-15", field)
-        assert result == "2024-01-15"
+class TestParseDate:
+    """parse_date のテスト."""
 
-        with pytest.raises(ValueError, match="YYYY-MM-DD 形式"):
-            FieldValidator.validate_date("2024/01/15", field)
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("2024-01-05", date(2024, 1, 5)),
+            ("2024-1-5", date(2024, 1, 5)),
+        ],
+    )
+    def test_parse_date(self, value, expected):
+        """YYYY-MM-DD 形式 (月・日は1桁も可) を受け付けることを確認."""
+        assert parse_date(value) == expected
 
-    def test_validate_time(self):
-        """時刻型の検証."""
-        field = TemplateField(
-            name="start_time",
-            label="開始時刻",
-            field_type=FieldType.TIME,
-        )
+    @pytest.mark.parametrize(
+        "value", ["20240105", "2024-W01-1", "2024/01/05", "2024-02-30", "2024-01-05\n"]
+    )
+    def test_parse_date_invalid(self, value):
+        """YYYY-MM-DD 以外の形式と存在しない日付を拒否することを確認."""
+        with raises_with(ValueError, "無効な日付形式です"):
+            parse_date(value)
 
-        # 正しい形式
-        assert FieldValidator.validate_time("09:00", field) == "09:00"
-        assert FieldValidator.validate_time("23:45", field) == "23:45"
 
-        # 15分刻みでない場合の丸め
-        assert FieldValidator.validate_time("09:07", field) == "09:00"
-        assert FieldValidator.validate_time("09:08", field) == "09:15"
-        assert FieldValidator.validate_time("09:23", field) == "09:30"
+class TestFieldValidator:
+    """FieldValidatorのテスト."""
 
-        # 不正な形式
-        with pytest.raises(ValueError, match="HH:MM 形式"):
-            FieldValidator.validate_time("9時30分", field)
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("today", _TODAY),
+            ("yesterday", _YESTERDAY),
+            ("tomorrow", _TOMORROW),
+        ],
+    )
+    @pytest.mark.usefixtures("frozen_today")
+    def test_validate_date_with_default(self, date_default_field, value, expected):
+        """日付型のデフォルト値検証."""
+        assert FieldValidator.validate_date(value, date_default_field) == expected
 
-    def test_validate_text(self):
+    def test_validate_date_with_value(self, date_field):
+        """日付型の値検証."""
+        result = FieldValidator.validate_date("2024-01-15", date_field)
+        assert result == "2024-01-15"
+        assert FieldValidator.validate_date("2024-1-5", date_field) == "2024-01-05"
+
+        with raises_with(ValueError, "YYYY-MM-DD 形式"):
+            FieldValidator.validate_date("2024/01/15", date_field)
+
+        with raises_with(ValueError, "YYYY-MM-DD 形式"):
+            FieldValidator.validate_date("20240115", date_field)
+
+        with raises_with(ValueError, "YYYY-MM-DD 形式"):
+            FieldValidator.validate_date("2024-02-30", date_field)
+
+    @pytest.mark.parametrize(
+        "inp,expected",
+        [
+            # 正しい形式
+            ("09:00", "09:00"),
+            ("23:45", "23:45"),
+            # 15分刻みでない場合の丸め
+            ("09:07", "09:00"),
+            ("09:08", "09:15"),
+            ("09:23", "09:30"),
+            ("10:53", "11:00"),
+            ("23:53", "00:00"),
+            ("9:30", "09:30"),
+        ],
+    )
+    def test_validate_time_rounding(self, time_field, inp, expected):
+        """時刻型の検証 (15分刻みへの丸め)."""
+        assert FieldValidator.validate_time(inp, time_field) == expected
+
+    def test_validate_time_invalid_format(self, time_field):
+        """時刻型の不正な形式."""
+        with raises_with(ValueError, "HH:MM 形式"):
+            FieldValidator.validate_time("9時30分", time_field)
+
+    def test_validate_text(self, text_field):
         """テキスト型の検証."""
-        field = TemplateField(
-            name="project",
-            label="プロジェクト",
-            field_type=FieldType.TEXT,
-            max_length=10,
-        )
-
         # 正常な値
-        assert FieldValidator.validate_text("プロジェクトA", field) == "プロジェクトA"
+        result = FieldValidator.validate_text("プロジェクトA", text_field)
+        assert result == "プロジェクトA"
 
         # 改行を含む場合
-        with pytest.raises(ValueError, match="改行を含めることはできません"):
-            FieldValidator.validate_text("プロジェクト\nA", field)
+        with raises_with(ValueError, "改行を含めることはできません"):
+            FieldValidator.validate_text("プロジェクト\nA", text_field)
 
         # 文字数超過
-        with pytest.raises(ValueError, match="10文字以内"):
-            FieldValidator.validate_text("あ" * 11, field)
+        with raises_with(ValueError, "10文字以内"):
+            FieldValidator.validate_text("あ" * 11, text_field)
 
-    def test_validate_selection(self):
+    def test_validate_selection(self, selection_field):
         """選択型の検証."""
-        field = TemplateField(
-            name="status",
-            label="ステータス",
-            field_type=FieldType.SELECTION,
-            options=["完了", "進行中", "未着手"],
-        )
-
         # 正しい選択肢
-        assert FieldValidator.validate_selection("完了", field) == "完了"
+        assert FieldValidator.validate_selection("完了", selection_field) == "完了"
 
         # 無効な選択肢
-        with pytest.raises(ValueError, match="有効な選択肢ではありません"):
-            FieldValidator.validate_selection("中断", field)
+        with raises_with(ValueError, "有効な選択肢ではありません"):
+            FieldValidator.validate_selection("中断", selection_field)
 
-    def test_validate_required_field(self):
+    def test_validate_required_field(self, required_content_field):
         """必須フィールドの検証."""
-        field = TemplateField(
-            name="content",
-            label="内容",
-            field_type=FieldType.TEXT,
-            required=True,
-        )
-
         # 値がない場合
-        with pytest.raises(ValueError, match="必須項目"):
-            FieldValidator.validate(None, field)
-        with pytest.raises(ValueError, match="必須項目"):
-            FieldValidator.validate("", field)
+        with raises_with(ValueError, "必須項目"):
+            FieldValidator.validate(None, required_content_field)
+        with raises_with(ValueError, "必須項目"):
+            FieldValidator.validate("", required_content_field)
 
 
 class TestValidateReportData:
     """validate_report_data関数のテスト."""
 
-    def test_validate_complete_data(self):
+    def test_validate_complete_data(self, report_fields):
         """完全なデータの検証."""
-        fields = [
-            TemplateField(
-                name="date",
-                label="日付",
-                field_type=FieldType.DATE,
-                required=True,
-            ),
-            TemplateField(
-                name="content",
-                label="内容",
-                field_type=FieldType.MEMO,
-                required=True,
-            ),
-        ]
-
         data = {
             "date": "2024-01-15",
             "content": "今日の作業内容",
         }
 
-        result = validate_report_data(data, fields)
+        result = validate_report_data(data, report_fields)
         assert result["date"] == "2024-01-15"
         assert result["content"] == "今日の作業内容"
 
-    def test_validate_with_missing_required(self):
+    def test_validate_with_missing_required(self, report_fields):
         """必須項目が不足している場合."""
+        data = {
+            "date": "2024-01-15",
+            # contentが不足
+        }
+
+        with pytest.raises(ValueError, match=_CONTENT_REQUIRED_RE):
+            validate_report_data(data, report_fields)
+
+    def test_validate_missing_optional_uses_default(self):
+        """任意項目が未入力の場合はデフォルト値を使い, 検証関数を呼ばないことを確認."""
         fields = [
             TemplateField(
-                name="date",
-                label="日付",
-                field_type=FieldType.DATE,
-                required=True,
+                name="start_time",
+                label="開始時刻",
+                field_type=FieldType.TIME,
+                required=False,
+                default_value="09:00",
             ),
             TemplateField(
-                name="content",
-                label="内容",
+                name="notes",
+                label="備考",
                 field_type=FieldType.MEMO,
-                required=True,
+                required=False,
             ),
         ]
 
-        data = {
-            "date": "2024-01-15",
-            # contentが不足
-        }
+        with patch.object(FieldValidator, "validate") as validate:
+            result = validate_report_data({"notes": ""}, fields)
 
-        with pytest.raises(ValueError, match="内容: .* は必須項目"):
-            validate_report_data(data, fields)
+        assert result == {"start_time": "09:00"}
+        validate.assert_not_called()
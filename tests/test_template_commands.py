@@ -0,0 +1,60 @@
+"""Tests for template commands"""
+
+from unittest.mock import patch
+
+import pytest
+
+from smart_nippo.core.models import FieldType
+from smart_nippo.core.services import TemplateService
+
+
+@pytest.mark.usefixtures("fresh_db")
+class TestTemplateCreate:
+    """Test interactive template creation"""
+
+    def test_create_template_from_field_answers(self, runner, app):
+        """Test each field is built from one questionary.prompt answer set"""
+        field_answers = [
+            {
+                "name": "project",
+                "label": "",
+                "field_type": "text",
+                "required": False,
+                "default_value": "",
+                "placeholder": "例: A",
+                "max_length": "50",
+            },
+            {
+                "name": "progress",
+                "label": "進捗",
+                "field_type": "selection",
+                "required": True,
+                "default_value": "",
+                "options": "完了, 進行中",
+            },
+            {"name": ""},
+        ]
+        texts = iter(["CLI Template", ""])
+
+        with (
+            patch("questionary.prompt", side_effect=field_answers) as mock_prompt,
+            patch("questionary.text") as mock_text,
+            patch("questionary.confirm") as mock_confirm,
+        ):
+            mock_text.return_value.ask.side_effect = lambda: next(texts)
+            mock_confirm.return_value.ask.return_value = False
+            result = runner.invoke(app, ["template", "create"])
+
+        assert result.exit_code == 0
+        assert "CLI Template" in result.stdout
+        assert mock_prompt.call_count == 3
+
+        template = TemplateService.get_template(name="CLI Template")
+        project, progress = template.fields
+        assert project.label == "project"
+        assert project.max_length == 50
+        assert project.placeholder == "例: A"
+        assert project.default_value is None
+        assert progress.field_type == FieldType.SELECTION
+        assert progress.options == ["完了", "進行中"]
+        assert progress.order == 2